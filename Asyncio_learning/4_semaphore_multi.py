@@ -1,12 +1,19 @@
 import asyncio
 import aiohttp
 import time
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
+
+from crawler import crawl
+from json_stream import consume_json_items
+from single_flight import SingleFlight
 
 """
 Semaphore Example
 - Use asyncio.Semaphore to limit the number of concurrent requests.
 - Create tasks for each URL and gather results.
+- Duplicate URLs in flight at the same time share one request (SingleFlight).
+- For very many URLs, use a fixed set of workers instead (crawl()), so only
+  a bounded number of URLs, tasks and results exist at any time.
 
 """
 
@@ -20,17 +27,31 @@ urls = [
 
 async def fetch_with_semaphore(session: aiohttp.ClientSession,
                               semaphore: asyncio.Semaphore,
-                              url: str) -> Dict[str, Any]:
+                              url: str,
+                              flight: SingleFlight = None,
+                              stream_path: str = None,
+                              on_item: Callable[[Any], Any] = None) -> Dict[str, Any]:
     """Fetch URL with semaphore to limit concurrent requests
     - Acquire semaphore before making the request.
     - Release semaphore after the request is complete.
     - Return the JSON response or error information.
+    - With a SingleFlight, concurrent calls for the same URL share one request.
+    - With stream_path (e.g. "data.item"), the elements of the array at that
+      path go to on_item as they are parsed instead of buffering and parsing
+      the whole body at once; data is then {"items": count}. Such calls do
+      not share a request, since every caller needs its own items.
     """
+    if flight is not None and stream_path is None:
+        return await flight.do(SingleFlight.key("GET", url),
+                               lambda: fetch_with_semaphore(session, semaphore, url))
     async with semaphore:  # Acquire semaphore
         print(f"Fetching {url}")
         try:
             async with session.get(url) as response:
-                data = await response.json()
+                if stream_path is not None:
+                    data = {"items": await consume_json_items(response, stream_path, on_item)}
+                else:
+                    data = await response.json()
                 print(f"\t Completed {url}")
                 return {"url": url, "status": response.status, "data": data}
         except Exception as e:
@@ -44,19 +65,39 @@ async def fetch_urls_with_tasks():
     
     # Create semaphore to limit concurrent requests
     semaphore = asyncio.Semaphore(3)  # Max 3 concurrent requests
+    # Duplicate URLs (e.g. the two /delay/1) are fetched once
+    flight = SingleFlight()
     # Creqate a session for making requests // only one session is needed
     async with aiohttp.ClientSession() as session:
         # Create tasks for all URLs
         tasks = [
-            asyncio.create_task(fetch_with_semaphore(session, semaphore, url))
+            asyncio.create_task(fetch_with_semaphore(session, semaphore, url, flight))
             for url in urls
         ]
         
         # Wait for all tasks to complete
         results = await asyncio.gather(*tasks)
+        print(f"Single-flight: {flight.stats()}")
         return results
 
+async def fetch_urls_with_workers(url_source, concurrency: int = 3):
+    """Fixed worker coroutines pulling from a bounded queue (no task per URL)
+    - url_source can be any sync or async iterable, even an endless generator.
+    - Results are yielded as they complete; a slow consumer pauses the workers.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    async with aiohttp.ClientSession() as session:
+        async for result in crawl(url_source,
+                                  lambda url: fetch_with_semaphore(session, semaphore, url),
+                                  concurrency=concurrency):
+            yield result
+
 async def main():
+    count = 0
+    async for result in fetch_urls_with_workers(iter(urls)):
+        count += 1
+    print(f"Worker-queue crawler fetched {count} URLs\n")
+    
     results = await fetch_urls_with_tasks()
     print(f"Fetched {len(results)} URLs\n")
     for i, result in enumerate(results, start=1):
@@ -1,40 +1,42 @@
 import asyncio
 import aiohttp
 import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Tuple
 
-async def advanced_web_scraper():
+from cpu_offload import CPUStage, summarize_json
+from retry_scheduler import RetryScheduler
+
+async def advanced_web_scraper(cpu_stage: CPUStage = None):
     """Advanced example with error handling, timeouts, and retries"""
     
-    async def fetch_with_retry(session: aiohttp.ClientSession,
-                               semaphore: asyncio.Semaphore,
-                               url: str,
-                               max_retries: int = 3) -> Dict[str, Any]:
-        """Fetch URL with retry logic"""
-        ## First, acquire the semaphore to limit concurrent requests
-        ## Then, make the request with error handling and retries
-        ## Use exponential backoff for retries
-        
-        async with semaphore:
-            for attempt in range(max_retries):
-                try:
-                    timeout = aiohttp.ClientTimeout(total=20)
-                    async with session.get(url, timeout=timeout) as response:
-                        print(f"Starting fetch for {url}")
-                        if response.status == 200:
-                            data = await response.json()
-                            return {
-                                "url": url, "status": response.status, "data": data,"attempt": attempt + 1
-                            }
-                        else:
-                            print(f"\t \t HTTP {response.status} for {url}")
-                except asyncio.TimeoutError:
-                    print(f"\t \t Timeout for {url}, attempt {attempt + 1}")
-                except Exception as e:
-                    print(f"\t \t Error for {url}, attempt {attempt + 1}: {e}")
-                if attempt < max_retries - 1:
-                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
-            return {"url": url, "error": "Max retries exceeded"}
+    async def fetch_once(session: aiohttp.ClientSession,
+                         url: str,
+                         attempt: int) -> Tuple[bool, Dict[str, Any]]:
+        """Single attempt; returns (done, result)"""
+        ## The scheduler hands us a slot only for the duration of the request
+        ## A failed attempt returns done=False and is retried from the timer
+        ## heap with exponential backoff, without holding the slot
+        ## With a cpu_stage, the body goes to its function in a worker process,
+        ## off the loop; data is what that function returns (e.g. a summary)
+        try:
+            timeout = aiohttp.ClientTimeout(total=20)
+            async with session.get(url, timeout=timeout) as response:
+                print(f"Starting fetch for {url}")
+                if response.status == 200:
+                    if cpu_stage is not None:
+                        data = await cpu_stage.submit(await response.read())
+                    else:
+                        data = await response.json()
+                    return True, {
+                        "url": url, "status": response.status, "data": data,"attempt": attempt + 1
+                    }
+                else:
+                    print(f"\t \t HTTP {response.status} for {url}")
+        except asyncio.TimeoutError:
+            print(f"\t \t Timeout for {url}, attempt {attempt + 1}")
+        except Exception as e:
+            print(f"\t \t Error for {url}, attempt {attempt + 1}: {e}")
+        return False, {"url": url, "error": "Max retries exceeded"}
     
     # Test URLs (some may fail intentionally)
     urls = [
@@ -44,24 +46,29 @@ async def advanced_web_scraper():
         'https://httpbin.org/get?id=2',
         'https://httpbin.org/status/200'
     ]
-    semaphore = asyncio.Semaphore(2)  # Limit to 2 concurrent requests
+    # Limit to 2 concurrent requests; retries wait on a timer heap, not in a slot
+    scheduler = RetryScheduler(concurrency=2, max_retries=3)
     # Create a session for making requests
-    # Create tasks for all URLs
     async with aiohttp.ClientSession() as session:
-        tasks = [
-            asyncio.create_task(fetch_with_retry(session, semaphore, url))
-            for url in urls
-        ]
-        results = await asyncio.gather(*tasks,return_exceptions=True)
+        results = await scheduler.run(urls, lambda url, attempt: fetch_once(session, url, attempt))
+        scheduler.print_report()
         return results
 
 async def main():
     print("Advanced Scraper Example")
-    results = await advanced_web_scraper()
+    # Parse and reduce in the workers: only a small summary comes back
+    async with CPUStage(summarize_json, max_workers=2) as cpu_stage:
+        results = await advanced_web_scraper(cpu_stage)
+    cpu_stage.print_report()
     successful = sum(1 for r in results if not isinstance(r, Exception) and "error" not in r)
     for result in results:
+        if isinstance(result, Exception):
+            print(f"Failed: {result}")
+            continue
         if 'error' not in result:
-            print(result['url'])
+            summary = result['data']
+            print(f"{result['url']}: {summary['type']} with {summary['items']} items "
+                  f"({summary['bytes']} bytes)")
         else:
             print(f"Failed: {result['url']} with error {result['error']}")
     print(f"Advanced scraper: {successful}/{len(results)} successful\n")
@@ -1,19 +1,92 @@
 import asyncio
 import aiohttp
 import time
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
 
-async def api_data_aggregator():
+from aggregation import aggregate
+from async_cache import AsyncTTLCache
+from cpu_offload import CPUStage, summarize_json
+from json_stream import consume_json_items
+from single_flight import SingleFlight
+
+# Shared across calls: aggregated data changes slowly, so serve it from memory
+response_cache = AsyncTTLCache(default_ttl=30.0, stale_grace=60.0, max_entries=256)
+# Per-endpoint freshness; /uuid is meant to change, so keep it short
+ENDPOINT_TTLS = {
+    'https://httpbin.org/uuid': 5.0,
+}
+# Opt-in (stream_paths=...): endpoints whose potentially large array is
+# handed to on_item element by element instead of being returned whole
+STREAM_PATHS = {
+    'https://httpbin.org/json': 'slideshow.slides.item',
+}
+
+# Background refreshes of stale entries finish after the call that found
+# them has returned (and closed its session), so they get their own
+# long-lived session; close_refresh_session() drains them at shutdown
+_refresh_session: aiohttp.ClientSession = None
+_refresh_semaphore: asyncio.Semaphore = None
+
+async def refresh_session() -> aiohttp.ClientSession:
+    global _refresh_session, _refresh_semaphore
+    if _refresh_session is None or _refresh_session.closed:
+        _refresh_session = aiohttp.ClientSession()
+        _refresh_semaphore = asyncio.Semaphore(2)
+    return _refresh_session
+
+async def close_refresh_session() -> None:
+    await response_cache.wait_refreshes()
+    if _refresh_session is not None:
+        await _refresh_session.close()
+
+async def api_data_aggregator(required: List[str] = (), first_k: int = None,
+                              cpu_stage: CPUStage = None, stream_paths: Dict[str, str] = None,
+                              on_item: Callable[[Any], Any] = None):
     async def fetch_api_data(session: aiohttp.ClientSession,
                             semaphore: asyncio.Semaphore,
                             endpoint: str,
-                            params: dict = None) -> Dict[str, Any]:
-        """Fetch data from API endpoint"""
+                            params: dict = None,
+                            flight: SingleFlight = None,
+                            cache: AsyncTTLCache = None,
+                            stream_path: str = None,
+                            on_item: Callable[[Any], Any] = None,
+                            cpu_stage: CPUStage = None) -> Dict[str, Any]:
+        """Fetch data from API endpoint (identical concurrent calls share one request)
+        
+        stream_path (e.g. "data.item") hands the elements of that array to
+        on_item as they are parsed, for large responses that would otherwise
+        block the loop while parsing; data is then {"items": count}. Streamed
+        calls skip the cache and single-flight: every caller needs its items.
+        With a cpu_stage, the body is handed to its function in a worker
+        process instead and data is that function's result; that function is
+        part of the cache key, so raw and transformed data never mix.
+        """
+        key = SingleFlight.key("GET", endpoint, params) + (cpu_stage.func if cpu_stage else None,)
+        if cache is not None and stream_path is None:
+            async def refresh():
+                # Outlives this call: no per-call session. Same transform, so
+                # the entry keeps its shape (after the stage is closed its
+                # function runs in the default thread pool)
+                return await fetch_api_data(await refresh_session(), _refresh_semaphore,
+                                            endpoint, params, cpu_stage=cpu_stage)
+            return await cache.get_or_fetch(key,
+                                            lambda: fetch_api_data(session, semaphore, endpoint, params, flight,
+                                                                   cpu_stage=cpu_stage),
+                                            ttl=ENDPOINT_TTLS.get(endpoint), refresh=refresh)
+        if flight is not None and stream_path is None:
+            return await flight.do(key,
+                                   lambda: fetch_api_data(session, semaphore, endpoint, params,
+                                                          cpu_stage=cpu_stage))
         async with semaphore:
             try:
                 async with session.get(endpoint, params=params) as response:
                     if response.status == 200:
-                        data = await response.json()
+                        if stream_path is not None:
+                            data = {"items": await consume_json_items(response, stream_path, on_item)}
+                        elif cpu_stage is not None:
+                            data = await cpu_stage.submit(await response.read())
+                        else:
+                            data = await response.json()
                         return {"endpoint": endpoint, "data": data, "success": True}
                     else:
                         return {"endpoint": endpoint, "error": f"HTTP {response.status}", "success": False}
@@ -27,27 +100,65 @@ async def api_data_aggregator():
         'https://httpbin.org/get?category=posts',
         'https://httpbin.org/get?category=comments'
     ]
+    if cpu_stage is not None and stream_paths:
+        # Streamed items go to on_item on the loop; a CPU stage would return
+        # its own result shape for the other endpoints only
+        raise ValueError("cpu_stage and stream_paths cannot be combined")
     semaphore = asyncio.Semaphore(3)  # Max 3 concurrent API calls
+    flight = SingleFlight()
+    stream_paths = stream_paths or {}
     async with aiohttp.ClientSession() as session:
-        # Create tasks for all endpoints
-        tasks = [
-            asyncio.create_task(fetch_api_data(session, semaphore, endpoint))
+        # One call per endpoint, each with its own deadline; a slow endpoint
+        # is marked as timed out instead of discarding everything else
+        calls = {
+            endpoint: (lambda endpoint=endpoint: fetch_api_data(session, semaphore, endpoint,
+                                                        flight=flight, cache=response_cache,
+                                                        stream_path=stream_paths.get(endpoint),
+                                                        on_item=on_item,
+                                                        cpu_stage=cpu_stage))
             for endpoint in endpoints
-        ]
-        # Wait for all tasks with timeout
-        try:
-            results = await asyncio.wait_for(asyncio.gather(*tasks),timeout=10.0)
-            # Process results
-            successful = [r for r in results if r.get("success")]
-            failed = [r for r in results if not r.get("success")]
-            return {"successful": len(successful),"failed": len(failed),"results": results}
-        except asyncio.TimeoutError:
-            return {"error": "Operation timed out"}
+        }
+        return await aggregate(calls, endpoint_timeout=5.0, overall_timeout=10.0,
+                               required=required, first_k=first_k)
 # 10. MAIN EXECUTION EXAMPLES
 async def main():
     print("API Data Aggregator Example")
     results = await api_data_aggregator()
-    print(f"API aggregator: {results['successful']} successful, {results['failed']} failed\n")
+    print(f"API aggregator: {results['successful']} successful, {results['failed']} failed, "
+          f"{results['timed_out']} timed out in {results['elapsed']:.2f}s\n")
+    for result in results["results"]:
+        if result.get("timed_out"):
+            print(f"\t Timed out: {result['endpoint']} ({result['error']})")
+    
+    # Answer as soon as the first required endpoint is in
+    required = ['https://httpbin.org/uuid', 'https://httpbin.org/json']
+    results = await api_data_aggregator(required=required, first_k=1)
+    print(f"First of {len(required)} required: {results['successful']} successful, "
+          f"{results['timed_out']} not waited for, in {results['elapsed']:.2f}s\n")
+    
+    # Same call again: answered from the response cache
+    results = await api_data_aggregator()
+    print(f"Cached API aggregator: {results['successful']} successful in {results['elapsed']:.2f}s")
+    response_cache.print_report()
+    
+    # JSON parsing in worker processes instead of on the event loop; the
+    # workers reduce each body to a summary so little is shipped back
+    # (cached apart from the raw responses above)
+    async with CPUStage(summarize_json, max_workers=2) as cpu_stage:
+        results = await api_data_aggregator(cpu_stage=cpu_stage)
+    print(f"Offloaded API aggregator: {results['successful']} successful in {results['elapsed']:.2f}s")
+    cpu_stage.print_report()
+    
+    # Opt in to streaming for /json: slides are handled one by one as they
+    # are parsed instead of buffering and parsing the whole body at once
+    titles = []
+    results = await api_data_aggregator(stream_paths=STREAM_PATHS,
+                                        on_item=lambda slide: titles.append(slide.get('title')))
+    print(f"Streamed API aggregator: {results['successful']} successful, "
+          f"slides from /json: {titles}")
+    
+    # Let background refreshes finish before the loop goes away
+    await close_refresh_session()
 # Run the examples
 if __name__ == "__main__":
     asyncio.run(main())
@@ -3,6 +3,8 @@ import aiohttp
 import time
 from typing import List, Dict, Any
 
+from loop_monitor import monitored
+
 
 async def performance_comparison():
     """Compare sync vs async performance"""
@@ -45,4 +47,6 @@ async def main():
     print(f"Synchronous version took {sync_time:.2f}s")
     
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    # The monitor flags the blocking requests.get() calls in main() as slow
+    # task steps and shows the loop lag they cause
+    asyncio.run(monitored(main(), slow_threshold=0.1, dump_path="loop_monitor.json"))
\ No newline at end of file
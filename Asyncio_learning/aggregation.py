@@ -0,0 +1,102 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+
+"""
+Partial-Result Aggregation Example
+- Every endpoint gets its own deadline (asyncio.wait_for per task), and the
+  whole aggregation gets an overall deadline.
+- Whatever arrived in time is returned; endpoints that did not finish get an
+  explicit timeout marker instead of throwing all results away.
+- Optionally return as soon as the first K "required" endpoints are in, so
+  the caller can answer without waiting for optional extras.
+
+Usage:
+    report = await aggregate({
+        "users": lambda: fetch_api_data(session, semaphore, users_url),
+        "posts": lambda: fetch_api_data(session, semaphore, posts_url),
+    }, endpoint_timeout=3.0, overall_timeout=10.0, required=["users"])
+"""
+
+
+def timeout_marker(name: str, reason: str) -> Dict[str, Any]:
+    return {"endpoint": name, "error": reason, "success": False, "timed_out": True}
+
+
+async def aggregate(calls: Dict[str, Callable[[], Awaitable[Dict[str, Any]]]],
+                    endpoint_timeout: float = 5.0,
+                    overall_timeout: float = 10.0,
+                    timeouts: Optional[Dict[str, float]] = None,
+                    required: Iterable[str] = (),
+                    first_k: Optional[int] = None) -> Dict[str, Any]:
+    """Run all calls concurrently and collect whatever finishes in time
+
+    - calls: endpoint name -> zero-argument coroutine function
+    - endpoint_timeout: Default per-endpoint deadline in seconds
+    - overall_timeout: Deadline for the whole aggregation
+    - timeouts: Per-endpoint overrides of endpoint_timeout
+    - required: Endpoints the caller cannot answer without
+    - first_k: Return once this many required endpoints are in
+      (default: all of them; only used when required is given)
+
+    Returns a dict with one result per endpoint (in the order of calls),
+    counts of successful / failed / timed-out endpoints, and whether every
+    endpoint finished ("complete").
+    """
+    timeouts = timeouts or {}
+    required = set(required)
+    if required and first_k is None:
+        first_k = len(required)
+    start = time.monotonic()
+
+    async def run(name: str) -> Dict[str, Any]:
+        limit = timeouts.get(name, endpoint_timeout)
+        try:
+            return await asyncio.wait_for(calls[name](), timeout=limit)
+        except asyncio.TimeoutError:
+            return timeout_marker(name, f"Endpoint timed out after {limit:.1f}s")
+
+    tasks = {asyncio.create_task(run(name)): name for name in calls}
+    results: Dict[str, Dict[str, Any]] = {}
+    pending = set(tasks)
+    required_in = 0
+    reason = None
+    try:
+        while pending:
+            remaining = overall_timeout - (time.monotonic() - start)
+            if remaining <= 0:
+                reason = f"Overall deadline of {overall_timeout:.1f}s reached"
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                name = tasks[task]
+                try:
+                    results[name] = task.result()
+                except Exception as e:
+                    results[name] = {"endpoint": name, "error": str(e), "success": False}
+                if name in required:
+                    required_in += 1
+            if required and required_in >= first_k and pending:
+                reason = f"Returned after {required_in} required endpoints were in"
+                break
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    for task in pending:
+        results[tasks[task]] = timeout_marker(tasks[task], reason)
+
+    ordered = [results[name] for name in calls]
+    timed_out = sum(1 for r in ordered if r.get("timed_out"))
+    successful = sum(1 for r in ordered if r.get("success"))
+    return {
+        "successful": successful,
+        "failed": len(ordered) - successful - timed_out,
+        "timed_out": timed_out,
+        "complete": not pending,
+        "elapsed": time.monotonic() - start,
+        "results": ordered,
+    }
@@ -0,0 +1,166 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+from single_flight import SingleFlight
+
+"""
+Async TTL Cache Example
+- Responses are kept for a TTL (per call, e.g. per endpoint) in an LRU of
+  bounded size.
+- Stale-while-revalidate: for a grace period after the TTL the stale value
+  is returned immediately and a background task refreshes it.
+- Concurrent misses for the same key share one fetch (SingleFlight).
+- Hit ratio and refresh latency are tracked for a report.
+
+Usage:
+    cache = AsyncTTLCache(default_ttl=30, stale_grace=60)
+    result = await cache.get_or_fetch(key, lambda: fetch(session, url), ttl=10,
+                                      refresh=lambda: fetch(long_lived_session, url))
+    ...
+    await cache.wait_refreshes()  # at shutdown, before closing long_lived_session
+"""
+
+
+class _Entry:
+    __slots__ = ('value', 'fresh_until', 'stale_until')
+
+    def __init__(self, value: Any, ttl: float, grace: float):
+        now = time.monotonic()
+        self.value = value
+        self.fresh_until = now + ttl
+        self.stale_until = now + ttl + grace
+
+
+def _is_success(result: Any) -> bool:
+    return not isinstance(result, dict) or result.get("success", True)
+
+
+class AsyncTTLCache:
+    """LRU response cache with per-entry TTL and stale-while-revalidate"""
+
+    def __init__(self, default_ttl: float = 30.0, stale_grace: float = 60.0,
+                 max_entries: int = 256,
+                 cacheable: Callable[[Any], bool] = _is_success):
+        """
+        default_ttl: Seconds an entry is fresh when get_or_fetch gets no ttl
+        stale_grace: Seconds after the TTL during which the stale value is
+                     served while it is refreshed in the background
+        max_entries: Entries kept before the least recently used is evicted
+        cacheable: Decides whether a result is stored (default: not failures)
+        """
+        self.default_ttl = default_ttl
+        self.stale_grace = stale_grace
+        self.max_entries = max_entries
+        self.cacheable = cacheable
+        self._entries: "OrderedDict[Hashable, _Entry]" = OrderedDict()
+        self._flight = SingleFlight()
+        self._refreshing: Dict[Hashable, asyncio.Task] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+        self.refresh_time = 0.0
+        self.max_refresh_time = 0.0
+
+    async def get_or_fetch(self, key: Hashable, fetch: Callable[[], Awaitable[Any]],
+                           ttl: Optional[float] = None,
+                           refresh: Optional[Callable[[], Awaitable[Any]]] = None) -> Any:
+        """Return the cached value for key, fetching (once) when missing or expired
+
+        refresh is used for background refreshes of stale entries (default:
+        fetch). It runs after this call has returned, so it must not depend
+        on resources the caller is about to close, such as its session.
+        """
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = self._entries.get(key)
+        now = time.monotonic()
+        if entry is not None:
+            if now < entry.fresh_until:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry.value
+            if now < entry.stale_until:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                if key not in self._refreshing:
+                    task = asyncio.create_task(self._refresh(key, refresh or fetch, ttl))
+                    self._refreshing[key] = task
+                    task.add_done_callback(lambda _, key=key: self._refreshing.pop(key, None))
+                return entry.value
+
+        self.misses += 1
+        return await self._flight.do(key, lambda: self._load(key, fetch, ttl))
+
+    async def _load(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        value = await fetch()
+        if self.cacheable(value):
+            self._store(key, value, ttl)
+        return value
+
+    async def _refresh(self, key: Hashable, fetch: Callable[[], Awaitable[Any]], ttl: float) -> None:
+        start = time.monotonic()
+        try:
+            value = await fetch()
+        except Exception:
+            value = None
+            ok = False
+        else:
+            ok = self.cacheable(value)
+        elapsed = time.monotonic() - start
+        self.refreshes += 1
+        self.refresh_time += elapsed
+        self.max_refresh_time = max(self.max_refresh_time, elapsed)
+        if ok:
+            self._store(key, value, ttl)
+        else:
+            # Keep serving the stale value until its grace period ends
+            self.refresh_failures += 1
+
+    def _store(self, key: Hashable, value: Any, ttl: float) -> None:
+        self._entries[key] = _Entry(value, ttl, self.stale_grace)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Forget one key (or everything)"""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    async def wait_refreshes(self) -> None:
+        """Wait for background refreshes still running"""
+        if self._refreshing:
+            await asyncio.gather(*list(self._refreshing.values()), return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            'hits': self.hits,
+            'stale_hits': self.stale_hits,
+            'misses': self.misses,
+            'hit_ratio': (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            'coalesced_misses': self._flight.coalesced,
+            'entries': len(self._entries),
+            'evictions': self.evictions,
+            'refreshes': self.refreshes,
+            'refresh_failures': self.refresh_failures,
+            'avg_refresh_time': self.refresh_time / self.refreshes if self.refreshes else 0.0,
+            'max_refresh_time': self.max_refresh_time,
+        }
+
+    def print_report(self) -> None:
+        s = self.stats()
+        print(f"Response cache: {s['hit_ratio']:.0%} hit ratio "
+              f"({s['hits']} fresh, {s['stale_hits']} stale, {s['misses']} misses, "
+              f"{s['coalesced_misses']} coalesced), {s['entries']} entries, "
+              f"{s['evictions']} evicted")
+        if s['refreshes']:
+            print(f"  background refreshes: {s['refreshes']} ({s['refresh_failures']} failed), "
+                  f"avg {s['avg_refresh_time']:.3f}s, max {s['max_refresh_time']:.3f}s")
@@ -0,0 +1,187 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+"""
+CPU Offload Example
+- Parsing and transforming responses inside a coroutine runs on the event
+  loop thread: it blocks every other request and uses one core at most.
+- CPUStage sends that work to a ProcessPoolExecutor via run_in_executor.
+- Small items are batched (by count or after a short delay) so one pickle
+  round trip carries many items instead of one.
+- At most max_in_flight items may be queued or running; submit() waits when
+  the pool is saturated (backpressure) instead of piling up work.
+- Per-stage timing: waiting for a slot, waiting in a batch, transfer
+  (pickling, IPC and queueing in the pool) and compute in the worker.
+- func must be picklable, i.e. defined at module level (like summarize_json).
+- The result travels back pickled and is unpickled on the loop thread, so
+  offloading pays off when func reduces the data (parse + extract/aggregate,
+  like summarize_json) and there are spare cores; shipping a huge parsed
+  document back (parse_json) costs about as much as parsing it in place.
+
+Usage:
+    async with CPUStage(summarize_json, max_workers=4) as stage:
+        summary = await stage.submit(await response.read())
+    stage.print_report()
+"""
+
+
+def parse_json(body: bytes) -> Any:
+    """Decode a JSON response body (runs in a worker process)
+
+    Returns the whole document, so the loop pays to unpickle all of it;
+    prefer a reducing function such as summarize_json.
+    """
+    return json.loads(body)
+
+
+def summarize_json(body: bytes) -> Dict[str, Any]:
+    """Decode a JSON body and keep only a small summary (runs in a worker)
+
+    Returns {'type', 'keys' (top-level keys of an object), 'items' (length
+    of the top-level object or array), 'bytes'}; only this crosses back to
+    the event loop, not the parsed document.
+    """
+    data = json.loads(body)
+    return {
+        'type': type(data).__name__,
+        'keys': sorted(data) if isinstance(data, dict) else [],
+        'items': len(data) if isinstance(data, (dict, list)) else 1,
+        'bytes': len(body),
+    }
+
+
+def _run_batch(func: Callable[[Any], Any], items: List[Any]) -> Tuple[List[Tuple[bool, Any]], float]:
+    """Worker side: apply func to every item, timing the compute part"""
+    start = time.perf_counter()
+    results = []
+    for item in items:
+        try:
+            results.append((True, func(item)))
+        except Exception as e:
+            results.append((False, e))
+    return results, time.perf_counter() - start
+
+
+class CPUStage:
+    """Batching, back-pressured process-pool stage for CPU-bound work"""
+
+    def __init__(self, func: Callable[[Any], Any], max_workers: Optional[int] = None,
+                 batch_size: int = 16, batch_delay: float = 0.005,
+                 max_in_flight: Optional[int] = None):
+        """
+        func: Picklable function applied to every item in a worker process
+        max_workers: Worker processes (default: CPU count)
+        batch_size: Items sent to a worker in one call
+        batch_delay: Seconds a partial batch waits for more items
+        max_in_flight: Items queued or running before submit() waits
+                       (default: 2 batches per worker)
+        """
+        self.func = func
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.batch_delay = batch_delay
+        self.max_in_flight = max_in_flight or 2 * batch_size * self.max_workers
+        self._slots = asyncio.Semaphore(self.max_in_flight)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._batch: List[Tuple[Any, asyncio.Future, float]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = set()
+        self.items = 0
+        self.batches = 0
+        self.timings = {'slot_wait': 0.0, 'batch_wait': 0.0, 'transfer': 0.0, 'compute': 0.0}
+
+    async def submit(self, item: Any) -> Any:
+        """Process item in the pool and return func(item)
+
+        Before start() or after close() there is no pool; items then run in
+        the loop's default thread pool.
+        """
+        start = time.perf_counter()
+        await self._slots.acquire()  # Backpressure: pool and queue are full
+        self.timings['slot_wait'] += time.perf_counter() - start
+        try:
+            future = asyncio.get_running_loop().create_future()
+            self._batch.append((item, future, time.perf_counter()))
+            if len(self._batch) >= self.batch_size:
+                self._flush()
+            elif self._timer is None:
+                self._timer = asyncio.get_running_loop().call_later(self.batch_delay, self._flush)
+            return await future
+        finally:
+            self._slots.release()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._batch:
+            return
+        batch, self._batch = self._batch, []
+        task = asyncio.ensure_future(self._dispatch(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future, float]]) -> None:
+        loop = asyncio.get_running_loop()
+        sent = time.perf_counter()
+        self.timings['batch_wait'] += sum(sent - queued for _, _, queued in batch)
+        try:
+            results, compute = await loop.run_in_executor(
+                self._pool, _run_batch, self.func, [item for item, _, _ in batch])
+        except Exception as e:  # Pool broken, func not picklable, ...
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        self.batches += 1
+        self.items += len(batch)
+        self.timings['compute'] += compute
+        self.timings['transfer'] += (time.perf_counter() - sent) - compute
+        for (_, future, _), (ok, value) in zip(batch, results):
+            if future.done():  # Caller was cancelled
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    async def start(self) -> "CPUStage":
+        self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self
+
+    async def close(self) -> None:
+        self._flush()
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+        if self._pool is not None:
+            # Joining the workers blocks; keep it off the loop too
+            await asyncio.get_running_loop().run_in_executor(None, self._pool.shutdown)
+            self._pool = None
+
+    async def __aenter__(self) -> "CPUStage":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.close()
+
+    def report(self) -> Dict[str, float]:
+        """Totals per stage in seconds, plus per-item averages"""
+        report = dict(self.timings)
+        report['items'] = self.items
+        report['batches'] = self.batches
+        report['avg_batch_size'] = self.items / self.batches if self.batches else 0.0
+        for stage in self.timings:
+            report[f'{stage}_per_item'] = self.timings[stage] / self.items if self.items else 0.0
+        return report
+
+    def print_report(self) -> None:
+        r = self.report()
+        print(f"CPU stage: {r['items']} items in {r['batches']} batches "
+              f"(avg {r['avg_batch_size']:.1f}) on {self.max_workers} processes")
+        for stage in self.timings:
+            print(f"  {stage:<10}: {r[stage]:.3f}s total, "
+                  f"{r[stage + '_per_item'] * 1000:.2f}ms per item")
@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Iterable, Union
+
+"""
+Worker-Queue Crawler Example
+- Instead of one asyncio.Task per URL, a fixed number of worker coroutines
+  pull URLs from a bounded asyncio.Queue.
+- The input can be a sync iterable (list, generator, open file) or an async
+  iterable; it is only read as fast as the workers take URLs.
+- Results come out of an async iterator, in completion order. If the caller
+  stops reading, the output queue fills, the workers pause and the input is
+  no longer read: memory stays bounded however many URLs there are.
+
+Usage:
+    async for result in crawl(urls, lambda url: fetch(session, url), concurrency=10):
+        ...
+"""
+
+_DONE = object()
+
+
+async def _aiter(items: Union[Iterable, AsyncIterable]) -> AsyncIterator:
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def crawl(items: Union[Iterable, AsyncIterable],
+                worker_fn: Callable[[Any], Awaitable[Any]],
+                concurrency: int = 10,
+                queue_size: int = None) -> AsyncIterator[Any]:
+    """Run worker_fn over items with a fixed pool of workers, yielding results
+
+    - items: Sync or async iterable of inputs (e.g. URLs)
+    - worker_fn: Coroutine function called once per item
+    - concurrency: Number of worker coroutines (requests in flight)
+    - queue_size: Capacity of the input and output queues
+      (default: 2 x concurrency)
+
+    An exception raised by worker_fn is yielded as that item's result (like
+    gather(return_exceptions=True)); an exception from the input iterable
+    stops the crawl and is raised to the caller.
+    """
+    queue_size = queue_size or 2 * concurrency
+    inbox: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    outbox: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+    source_error = []
+
+    async def produce() -> None:
+        try:
+            async for item in _aiter(items):
+                await inbox.put(item)  # Blocks while the workers are busy
+        except Exception as e:
+            source_error.append(e)
+        # Not in a finally: once cancelled, nobody is left to drain the queue
+        for _ in range(concurrency):
+            await inbox.put(_DONE)
+
+    async def work() -> None:
+        try:
+            while True:
+                item = await inbox.get()
+                try:
+                    if item is _DONE:
+                        return
+                    try:
+                        result = await worker_fn(item)
+                    except Exception as e:
+                        result = e
+                    await outbox.put(result)  # Blocks while the caller is not reading
+                finally:
+                    inbox.task_done()
+        finally:
+            # Also when worker_fn raised a BaseException (e.g. CancelledError):
+            # crawl() counts _DONE markers and would wait forever without it.
+            # Skipped when crawl() itself cancels us: nobody reads any more
+            if not asyncio.current_task().cancelling():
+                await outbox.put(_DONE)
+
+    tasks = [asyncio.create_task(produce())]
+    tasks += [asyncio.create_task(work()) for _ in range(concurrency)]
+    try:
+        finished = 0
+        while finished < concurrency:
+            result = await outbox.get()
+            if result is _DONE:
+                finished += 1
+            else:
+                yield result
+        if source_error:
+            raise source_error[0]
+    finally:
+        # The caller may stop early (break / aclose); don't leave workers behind
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,159 @@
+import asyncio
+import codecs
+import json
+from typing import Any, AsyncIterator, Callable, List, Optional
+
+"""
+Incremental JSON Example
+- await response.json() buffers the whole body and parses it in one step on
+  the event loop; for a large payload every other coroutine waits.
+- iter_json_items() reads the body in chunks and yields the elements of one
+  array as soon as each is complete, returning control to the loop between
+  chunks and every few items.
+- The array is picked with an ijson-style path: "item" is the top-level
+  array, "data.item" the array under key "data",
+  "slideshow.slides.item" the slides in httpbin's /json.
+- Uses ijson when it is installed, otherwise a small built-in scanner based
+  on json.JSONDecoder.raw_decode (only the array's siblings are buffered).
+
+Usage:
+    async with session.get(url) as response:
+        async for record in iter_json_items(response, "data.item"):
+            ...
+"""
+
+try:
+    import ijson
+except ImportError:  # Optional: the built-in scanner is used instead
+    ijson = None
+
+_WHITESPACE = ' \t\n\r'
+_DELIMITERS = _WHITESPACE + ',]}'
+_decoder = json.JSONDecoder()
+
+
+class _Reader:
+    """Text buffer filled from an aiohttp StreamReader in chunks"""
+
+    def __init__(self, stream, chunk_size: int):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.decode = codecs.getincrementaldecoder('utf-8')().decode
+        self.buf = ''
+        self.pos = 0
+        self.eof = False
+
+    async def fill(self) -> None:
+        """Read one more chunk; drop what has been consumed already"""
+        chunk = await self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.buf = self.buf[self.pos:] + self.decode(chunk, final=self.eof)
+        self.pos = 0
+
+    async def peek(self) -> str:
+        """Next non-whitespace character ('' at end of body)"""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buf) or self.eof:
+                return self.buf[self.pos:self.pos + 1]
+            await self.fill()
+
+    async def expect(self, chars: str) -> str:
+        char = await self.peek()
+        if not char or char not in chars:
+            raise ValueError(f"Expected one of {chars!r} in JSON body, got {char!r}")
+        self.pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value, reading more until it is whole"""
+        await self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+                # A number cut by a chunk boundary ('1.' or '1e' then '5')
+                # decodes as a shorter number; only accept it once a delimiter
+                # follows
+                is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+                if self.eof or (end < len(self.buf) and
+                                (not is_number or self.buf[end] in _DELIMITERS)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Incomplete: grow the buffer by at least its pending size, so one
+            # large value is not re-parsed once per chunk
+            pending = len(self.buf) - self.pos
+            while not self.eof and len(self.buf) - self.pos < 2 * pending:
+                await self.fill()
+
+
+async def _scan_items(stream, path: List[str], chunk_size: int) -> AsyncIterator[Any]:
+    reader = _Reader(stream, chunk_size)
+    for key in path:
+        # Walk into the object until the wanted key; sibling values are skipped
+        await reader.expect('{')
+        while True:
+            if await reader.peek() == '}':
+                raise KeyError(key)
+            name = await reader.value()
+            await reader.expect(':')
+            if name == key:
+                break
+            await reader.value()
+            if await reader.expect(',}') == '}':
+                raise KeyError(key)
+
+    await reader.expect('[')
+    if await reader.peek() == ']':
+        return
+    count = 0
+    while True:
+        yield await reader.value()
+        count += 1
+        if count % 100 == 0:
+            await asyncio.sleep(0)  # Buffered items: let other coroutines run
+        if await reader.expect(',]') == ']':
+            return
+
+
+async def iter_json_items(response, path: str = "item",
+                          chunk_size: int = 64 * 1024) -> AsyncIterator[Any]:
+    """Yield the elements of the array at path as they arrive
+
+    - response: aiohttp ClientResponse (its body must not have been read yet)
+    - path: ijson-style prefix ending in ".item" (or just "item")
+    - chunk_size: Bytes read from the connection at a time
+
+    Raises KeyError when a key on the path is missing and ValueError (or
+    json.JSONDecodeError) for a body that does not match.
+    """
+    if ijson is not None:
+        async for item in ijson.items(response.content, path, use_float=True):
+            yield item
+        return
+    keys = path.split('.')
+    if keys[-1] != 'item':
+        raise ValueError(f"Path must end in 'item', got {path!r}")
+    async for item in _scan_items(response.content, keys[:-1], chunk_size):
+        yield item
+
+
+async def consume_json_items(response, path: str = "item",
+                             on_item: Optional[Callable[[Any], Any]] = None) -> int:
+    """Hand each element of the array at path to on_item as it is parsed
+
+    Nothing is collected, so memory stays flat however long the array is.
+
+    Returns:
+        Number of elements seen
+    """
+    count = 0
+    async for item in iter_json_items(response, path):
+        count += 1
+        if on_item is not None:
+            on_item(item)
+    return count
@@ -0,0 +1,298 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Coroutine, Dict, Optional
+
+"""
+Event Loop Monitor Example
+- Scheduling lag: a heartbeat coroutine asks to wake up every `interval`
+  seconds and records how late it actually ran. Lag means something kept
+  the loop busy (blocking I/O, CPU work, a huge json.loads, ...).
+- Slow callbacks: while attached, every callback the loop runs is timed
+  (asyncio.Handle._run is wrapped; one perf_counter pair per callback).
+  Callbacks and task steps longer than `slow_threshold` are recorded with
+  their source location.
+  Handle._run is a private asyncio API and may change between Python
+  versions. The wrapper is process-wide: it is installed with the first
+  monitor, removed with the last one, and only times callbacks of a loop
+  that has a monitor attached (one monitor per loop).
+- Tasks are counted by state (scheduled / waiting / done / cancelled / failed).
+- Prints a summary every `report_interval` seconds and can dump everything
+  as JSON.
+
+Usage:
+    asyncio.run(monitored(main(), dump_path="loop_monitor.json"))
+or:
+    async with LoopMonitor() as monitor:
+        ...
+"""
+
+_ASYNCIO_DIR = os.path.dirname(asyncio.__file__)
+
+# Monitored loops; Handle._run stays wrapped while this is not empty
+_monitors: Dict[asyncio.AbstractEventLoop, "LoopMonitor"] = {}
+_monitors_lock = threading.Lock()
+_original_run = None
+
+
+def _timed_run(handle: asyncio.Handle):
+    monitor = _monitors.get(asyncio._get_running_loop())
+    if monitor is None:
+        return _original_run(handle)  # A loop nobody monitors (e.g. another thread's)
+    start = time.perf_counter()
+    try:
+        return _original_run(handle)
+    finally:
+        duration = time.perf_counter() - start
+        monitor.callbacks += 1
+        if duration >= monitor.slow_threshold:
+            monitor._record_slow(handle, duration)
+
+
+def _attach(loop: asyncio.AbstractEventLoop, monitor: "LoopMonitor") -> None:
+    global _original_run
+    with _monitors_lock:
+        if loop in _monitors:
+            raise RuntimeError("Another LoopMonitor is already attached to this loop")
+        if not _monitors:
+            _original_run = asyncio.Handle._run
+            asyncio.Handle._run = _timed_run
+        _monitors[loop] = monitor
+
+
+def _detach(loop: asyncio.AbstractEventLoop) -> None:
+    global _original_run
+    with _monitors_lock:
+        _monitors.pop(loop, None)
+        if not _monitors and _original_run is not None:
+            asyncio.Handle._run = _original_run
+            _original_run = None
+
+
+def describe_callback(handle: asyncio.Handle) -> Dict[str, str]:
+    """Where a callback comes from: the task's coroutine, or the function"""
+    callback = handle._callback
+    task = getattr(callback, '__self__', None)
+    if isinstance(task, asyncio.Task):
+        coro = task.get_coro()
+        # Innermost coroutine of the await chain, stopping before asyncio itself
+        while True:
+            inner = getattr(coro, 'cr_await', None)
+            inner_code = getattr(inner, 'cr_code', None)
+            if inner_code is None or inner_code.co_filename.startswith(_ASYNCIO_DIR):
+                break
+            coro = inner
+        code = getattr(coro, 'cr_code', None) or getattr(coro, 'gi_code', None)
+        if code is not None:
+            location = f"{code.co_filename}:{code.co_firstlineno}"
+            frame = getattr(coro, 'cr_frame', None)
+            if frame is not None:
+                # The step ran up to the await it is now suspended at
+                location += f" (step ended at line {frame.f_lineno})"
+            name = getattr(code, 'co_qualname', code.co_name)
+            return {'kind': 'task step', 'name': f"{task.get_name()} {name}()",
+                    'location': location}
+    func = getattr(callback, 'func', callback)  # functools.partial
+    func = getattr(func, '__func__', func)      # bound method
+    code = getattr(func, '__code__', None)
+    name = getattr(func, '__qualname__', repr(func))
+    location = f"{code.co_filename}:{code.co_firstlineno}" if code is not None else "<builtin>"
+    return {'kind': 'callback', 'name': name, 'location': location}
+
+
+class LoopMonitor:
+    """Measures event-loop lag, slow callbacks and task states"""
+
+    def __init__(self, interval: float = 0.05, slow_threshold: float = 0.05,
+                 report_interval: float = 5.0, dump_path: Optional[str] = None,
+                 stream=sys.stderr):
+        """
+        interval: Heartbeat period in seconds (lag resolution)
+        slow_threshold: Callbacks running longer than this are flagged
+        report_interval: Seconds between printed summaries (None: only at the end)
+        dump_path: Write the JSON dump here when the monitor stops
+        stream: Where summaries are printed
+        """
+        self.interval = interval
+        self.slow_threshold = slow_threshold
+        self.report_interval = report_interval
+        self.dump_path = dump_path
+        self.stream = stream
+        self.lags: deque = deque(maxlen=10000)
+        self.max_lag = 0.0
+        self.callbacks = 0
+        self.slow_events: deque = deque(maxlen=100)
+        self.slow_by_location: Dict[str, Dict[str, Any]] = {}
+        self.finished = {'done': 0, 'cancelled': 0, 'failed': 0}
+        self.created = 0
+        self._tasks = []
+        self._expected = None
+        self._loop = None
+        self._original_factory = None
+
+    # -- callback timing -----------------------------------------------------
+
+    def _install(self, loop: asyncio.AbstractEventLoop) -> None:
+        _attach(loop, self)
+        self._loop = loop
+
+        # Count tasks as they are created and finish
+        self._original_factory = loop.get_task_factory()
+
+        def factory(loop, coro, **kwargs):
+            if self._original_factory is not None:
+                task = self._original_factory(loop, coro, **kwargs)
+            else:
+                task = asyncio.Task(coro, loop=loop, **kwargs)
+            self.created += 1
+            task.add_done_callback(self._task_finished)
+            return task
+
+        loop.set_task_factory(factory)
+
+    def _uninstall(self, loop: asyncio.AbstractEventLoop) -> None:
+        if self._loop is not None:
+            _detach(self._loop)
+            self._loop = None
+            loop.set_task_factory(self._original_factory)
+
+    def _record_slow(self, handle: asyncio.Handle, duration: float) -> None:
+        info = describe_callback(handle)
+        info['duration'] = duration
+        info['at'] = time.time()
+        self.slow_events.append(info)
+        stats = self.slow_by_location.setdefault(
+            info['location'], {'name': info['name'], 'kind': info['kind'],
+                               'count': 0, 'total': 0.0, 'max': 0.0})
+        stats['count'] += 1
+        stats['total'] += duration
+        stats['max'] = max(stats['max'], duration)
+
+    def _task_finished(self, task: asyncio.Task) -> None:
+        if task.cancelled():
+            self.finished['cancelled'] += 1
+        elif task.exception() is not None:
+            self.finished['failed'] += 1
+        else:
+            self.finished['done'] += 1
+
+    # -- heartbeat and reporting ----------------------------------------------
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self._record_lag(loop.time() - self._expected)
+
+    def _record_lag(self, lag: float) -> None:
+        lag = max(0.0, lag)
+        self.lags.append(lag)
+        self.max_lag = max(self.max_lag, lag)
+
+    async def _reporter(self) -> None:
+        while True:
+            await asyncio.sleep(self.report_interval)
+            self.print_summary()
+
+    def task_states(self) -> Dict[str, int]:
+        """Pending tasks split by state, plus finished counts since start"""
+        states = {'running': 0, 'scheduled': 0, 'waiting': 0}
+        current = asyncio.current_task()
+        for task in asyncio.all_tasks():
+            if task in self._tasks:
+                continue
+            if task is current:
+                states['running'] += 1
+            elif getattr(task, '_fut_waiter', None) is not None:
+                states['waiting'] += 1  # Awaiting a future (I/O, sleep, lock)
+            else:
+                states['scheduled'] += 1  # Ready, waiting for its turn on the loop
+        states.update(self.finished)
+        states['created'] = self.created
+        return states
+
+    def _lag_percentile(self, percent: float) -> float:
+        if not self.lags:
+            return 0.0
+        ordered = sorted(self.lags)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Machine-readable state of everything measured so far"""
+        return {
+            'lag': {
+                'samples': len(self.lags),
+                'p50': self._lag_percentile(50),
+                'p99': self._lag_percentile(99),
+                'max': self.max_lag,
+            },
+            'callbacks': self.callbacks,
+            'slow_threshold': self.slow_threshold,
+            'slow_callbacks': sorted(self.slow_by_location.items(),
+                                     key=lambda item: item[1]['total'], reverse=True),
+            'recent_slow': list(self.slow_events),
+            'tasks': self.task_states(),
+        }
+
+    def print_summary(self) -> None:
+        s = self.snapshot()
+        lag = s['lag']
+        print(f"[loop] lag p50 {lag['p50'] * 1000:.1f}ms, p99 {lag['p99'] * 1000:.1f}ms, "
+              f"max {lag['max'] * 1000:.1f}ms | {s['callbacks']} callbacks, "
+              f"{sum(v['count'] for _, v in s['slow_callbacks'])} slow | tasks {s['tasks']}",
+              file=self.stream)
+        for location, stats in s['slow_callbacks'][:5]:
+            print(f"[loop]   {stats['count']}x max {stats['max'] * 1000:.0f}ms "
+                  f"{stats['kind']} {stats['name']} at {location}", file=self.stream)
+
+    def dump(self, path: str) -> None:
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+    # -- lifecycle ---------------------------------------------------------------
+
+    async def start(self) -> "LoopMonitor":
+        # Own tasks first, so the task factory only counts the program's tasks
+        self._tasks = [asyncio.create_task(self._heartbeat())]
+        if self.report_interval:
+            self._tasks.append(asyncio.create_task(self._reporter()))
+        try:
+            self._install(asyncio.get_running_loop())
+        except RuntimeError:
+            for task in self._tasks:
+                task.cancel()
+            self._tasks = []
+            raise
+        return self
+
+    async def stop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._expected is not None and loop.time() > self._expected:
+            # A heartbeat that is overdue right now (e.g. main() just blocked)
+            self._record_lag(loop.time() - self._expected)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._uninstall(asyncio.get_running_loop())
+        self.print_summary()
+        if self.dump_path:
+            self.dump(self.dump_path)
+        self._tasks = []
+
+    async def __aenter__(self) -> "LoopMonitor":
+        return await self.start()
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+
+async def monitored(coro: Coroutine, **kwargs) -> Any:
+    """Run coro under a LoopMonitor: asyncio.run(monitored(main()))"""
+    async with LoopMonitor(**kwargs):
+        # Own task, so its steps are reported under the coroutine's name
+        return await asyncio.create_task(coro)
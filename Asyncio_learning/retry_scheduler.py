@@ -0,0 +1,179 @@
+import asyncio
+import heapq
+import itertools
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+
+"""
+Retry Scheduler Example
+- A fixed number of worker coroutines are the concurrency slots (instead of
+  a semaphore held for the whole retry loop).
+- A failed attempt does not sleep inside its slot: it goes on a timer heap
+  with its due time and the slot is immediately free for other work.
+- When a retry becomes due it is interleaved fairly with fresh work
+  (alternating), so neither retries nor new URLs starve.
+- Slot occupancy (fetching / idle) and backoff time are tracked for a report.
+
+Usage:
+    async def attempt(url, attempt_number):
+        ...  # return (True, result) when done, (False, result) to retry
+    scheduler = RetryScheduler(concurrency=2, max_retries=3)
+    results = await scheduler.run(urls, attempt)
+"""
+
+
+class _Run:
+    """State of one run() call; concurrent runs on a scheduler never share it"""
+
+    def __init__(self, items: Iterable, attempt_fn, concurrency: int):
+        self.fresh = enumerate(iter(items))
+        self.fresh_done = False
+        self.heap: List[Tuple[float, int, int, Any, int]] = []  # (due, seq, index, item, attempt)
+        self.seq = itertools.count()
+        self.results: Dict[int, Any] = {}
+        self.wakeup = asyncio.Event()
+        self.prefer_retry = False
+        self.in_flight = 0
+        self.state = ['idle'] * concurrency
+        self.since = [time.monotonic()] * concurrency
+        self.attempt_fn = attempt_fn
+
+
+class RetryScheduler:
+    """Runs attempts on a fixed pool of slots and retries failures from a timer heap"""
+
+    def __init__(self, concurrency: int = 2, max_retries: int = 3,
+                 base_delay: float = 1.0, max_delay: float = 30.0):
+        """
+        concurrency: Number of slots (requests in flight at once) per run
+        max_retries: Attempts per item, including the first one
+        base_delay: Backoff before the first retry; doubles on every retry
+        max_delay: Upper bound for a single backoff
+
+        The counters below add up over all runs; concurrent run() calls each
+        get their own slots and queues.
+        """
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._runs = set()
+        self.slot_time = {'fetching': 0.0, 'idle': 0.0}
+        self.attempts = 0
+        self.retries = 0
+        self.backoff_time = 0.0
+        self.retry_wait_time = 0.0
+        self.peak_backing_off = 0
+        self.elapsed = 0.0
+
+    def backoff(self, attempt: int) -> float:
+        """Exponential backoff after the given (0-based) attempt failed"""
+        return min(self.max_delay, self.base_delay * 2 ** attempt)
+
+    async def run(self, items: Iterable,
+                  attempt_fn: Callable[[Any, int], Awaitable[Tuple[bool, Any]]]) -> List[Any]:
+        """
+        Run attempt_fn for every item until it succeeds or runs out of retries
+
+        attempt_fn(item, attempt) returns (done, result). done=False schedules
+        a retry while attempts remain; otherwise result is final. An exception
+        is returned as the item's result (like gather(return_exceptions=True)).
+
+        Returns the final results in input order.
+        """
+        run = _Run(items, attempt_fn, self.concurrency)
+        self._runs.add(run)
+        start = time.monotonic()
+        try:
+            await asyncio.gather(*(self._worker(run, slot) for slot in range(self.concurrency)))
+        finally:
+            self.elapsed += time.monotonic() - start
+            self._runs.discard(run)
+        return [run.results[i] for i in range(len(run.results))]
+
+    def _set_state(self, run: _Run, slot: int, state: str) -> None:
+        now = time.monotonic()
+        self.slot_time[run.state[slot]] += now - run.since[slot]
+        run.state[slot] = state
+        run.since[slot] = now
+
+    def _next_job(self, run: _Run):
+        """Pick a due retry or a fresh item, alternating when both are available"""
+        now = time.monotonic()
+        retry_ready = bool(run.heap) and run.heap[0][0] <= now
+        fresh = None
+        if not run.fresh_done and (not retry_ready or not run.prefer_retry):
+            fresh = next(run.fresh, None)
+            if fresh is None:
+                run.fresh_done = True
+        if fresh is not None:
+            run.prefer_retry = True
+            index, item = fresh
+            return index, item, 0
+        if retry_ready:
+            run.prefer_retry = False
+            due, _, index, item, attempt = heapq.heappop(run.heap)
+            self.retry_wait_time += now - due
+            return index, item, attempt
+        return None
+
+    async def _worker(self, run: _Run, slot: int) -> None:
+        while True:
+            job = self._next_job(run)
+            if job is None:
+                if run.fresh_done and not run.heap and run.in_flight == 0:
+                    self._set_state(run, slot, 'idle')
+                    run.wakeup.set()  # Let the other idle workers exit too
+                    return
+                # Sleep until the next retry is due or the situation changes
+                timeout = run.heap[0][0] - time.monotonic() if run.heap else None
+                run.wakeup.clear()
+                try:
+                    await asyncio.wait_for(run.wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            index, item, attempt = job
+            run.in_flight += 1
+            self._set_state(run, slot, 'fetching')
+            self.attempts += 1
+            try:
+                done, result = await run.attempt_fn(item, attempt)
+            except Exception as e:
+                done, result = True, e
+            finally:
+                run.in_flight -= 1
+                self._set_state(run, slot, 'idle')
+
+            if done or attempt + 1 >= self.max_retries:
+                run.results[index] = result
+            else:
+                # Give the slot back; the retry waits on the heap, not in a slot
+                delay = self.backoff(attempt)
+                self.retries += 1
+                self.backoff_time += delay
+                heapq.heappush(run.heap, (time.monotonic() + delay, next(run.seq),
+                                          index, item, attempt + 1))
+                self.peak_backing_off = max(self.peak_backing_off,
+                                            sum(len(r.heap) for r in self._runs))
+            run.wakeup.set()
+
+    def snapshot(self) -> Dict[str, int]:
+        """Current slot occupancy by state plus items waiting in backoff (all runs)"""
+        states = [state for run in self._runs for state in run.state]
+        return {
+            'fetching': states.count('fetching'),
+            'idle': states.count('idle'),
+            'backing_off': sum(len(run.heap) for run in self._runs),
+        }
+
+    def print_report(self) -> None:
+        total = sum(self.slot_time.values()) or 1.0
+        print(f"Retry scheduler: {self.attempts} attempts, {self.retries} retries "
+              f"in {self.elapsed:.2f}s on {self.concurrency} slots")
+        for state, seconds in self.slot_time.items():
+            print(f"  slots {state:<8}: {seconds:6.2f} slot-s ({seconds / total:.0%})")
+        print(f"  backoff spent outside slots: {self.backoff_time:.2f}s "
+              f"(peak {self.peak_backing_off} items waiting, "
+              f"{self.retry_wait_time:.2f}s extra wait after due)")
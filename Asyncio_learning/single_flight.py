@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit, urlunsplit
+
+"""
+Single-Flight Example
+- When several coroutines ask for the same request at the same time, only the
+  first one (the leader) performs it; the others await the same result.
+- Requests are identified by method, URL and normalized params, so
+  '/get?b=2&a=1' and '/get' with params={'a': 1, 'b': 2} coalesce.
+- The request runs in its own task and callers await it through
+  asyncio.shield(): cancelling one caller (even the leader) does not cancel
+  the request for the others. Only when every caller is gone is it cancelled.
+- The shared result object is the same for every caller; treat it as read-only.
+
+Usage:
+    flight = SingleFlight()
+    key = SingleFlight.key("GET", url, params)
+    result = await flight.do(key, lambda: fetch(session, url, params))
+"""
+
+
+class _Call:
+    __slots__ = ('task', 'waiters')
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesces concurrent identical calls into one in-flight call"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, _Call] = {}
+        self.calls = 0       # do() invocations
+        self.executed = 0    # calls that actually ran
+        self.coalesced = 0   # calls that joined one already in flight
+
+    @staticmethod
+    def key(method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Tuple:
+        """Normalized (method, url, params) key; query order does not matter"""
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        if params:
+            items = params.items() if hasattr(params, 'items') else params
+            query += [(str(k), str(v)) for k, v in items]
+        base = urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', '', ''))
+        return method.upper(), base, tuple(sorted(query))
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Run fn() unless an identical call is already in flight, then share its result"""
+        self.calls += 1
+        call = self._inflight.get(key)
+        if call is None:
+            call = _Call(asyncio.ensure_future(fn()))
+            self._inflight[key] = call
+            call.task.add_done_callback(lambda _, key=key, call=call: self._forget(key, call))
+            self.executed += 1
+        else:
+            self.coalesced += 1
+
+        call.waiters += 1
+        try:
+            # shield: a cancelled caller stops waiting, the request keeps going
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if call.waiters == 0 and not call.task.done():
+                # Nobody is left to use the result
+                call.task.cancel()
+                self._forget(key, call)
+
+    def _forget(self, key: Hashable, call: _Call) -> None:
+        # A newer call for the same key may already have replaced this one
+        if self._inflight.get(key) is call:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'calls': self.calls,
+            'executed': self.executed,
+            'coalesced': self.coalesced,
+            'in_flight': len(self._inflight),
+        }
@@ -2,23 +2,31 @@ from utils import *
 
 
 
-def scrape_urls_basic(urls: List[str], max_workers: int = 5) -> List[Dict[str, any]]:
+def scrape_urls_basic(urls: List[str], max_workers: int = 5,
+                      deadline: Optional[float] = None) -> List[Dict[str, any]]:
     """
     Basic web scraping using ThreadPoolExecutor with map()
     
     Args:
         urls: List of URLs to scrape
         max_workers: Maximum number of concurrent threads
+        deadline: Optional budget in seconds for the whole run. Per-request
+                  timeouts are shortened to fit and URLs not started in time
+                  come back marked with error_kind 'deadline'
     
     Returns:
         List of results for each URL
     """
     print(f"Starting basic scraping with {max_workers} workers...")
+    # One pooled connection per worker and host
+    default_pool.configure(max_workers)
     start_time = time.time()
+    deadline = Deadline.from_seconds(deadline)
+    fetch = fetch_with_deadline(deadline) if deadline is not None else fetch_url
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
         # map() maintains order and waits for all to complete
-        results = list(executor.map(fetch_url, urls))
+        results = list(executor.map(fetch, urls))
     
     total_time = time.time() - start_time
     print(f"Basic scraping completed in {total_time:.2f} seconds")
@@ -26,6 +34,8 @@ def scrape_urls_basic(urls: List[str], max_workers: int = 5) -> List[Dict[str, a
 
 
 if __name__ == "__main__":
+    # Revisits send conditional requests and reuse cached bodies on 304
+    enable_http_cache()
     # Sample URLs to scrape (replace with real URLs)
     print("=== COMPARISON OF DIFFERENT APPROACHES ===\n")
     
@@ -1,6 +1,9 @@
 from utils import *
 
-def scrape_urls_advanced(urls: List[str], max_workers: int = 5, timeout: int = 10) -> List[Dict[str, any]]:
+def scrape_urls_advanced(urls: List[str], max_workers: int = 5, timeout: int = 10,
+                         hedge: Optional[HedgePolicy] = None,
+                         deadline: Optional[float] = None,
+                         record_timings: bool = False) -> List[Dict[str, any]]:
     """
     Advanced web scraping using ThreadPoolExecutor with submit() and as_completed()
     
@@ -8,25 +11,44 @@ def scrape_urls_advanced(urls: List[str], max_workers: int = 5, timeout: int = 1
         urls: List of URLs to scrape
         max_workers: Maximum number of concurrent threads
         timeout: Request timeout for each URL
+        hedge: Optional HedgePolicy; slow requests get a duplicate and the
+               first answer wins
+        deadline: Optional budget in seconds for the whole run. Queued URLs
+                  are cancelled when it passes, per-request timeouts are
+                  shortened to fit, and unfinished URLs come back marked
+                  with error_kind 'deadline'. Combined with hedge, the
+                  duplicate copies fit in the same budget
+        record_timings: Attach per-phase timings to every result (for
+                        process_timings)
     
     Returns:
         List of results for each URL
     """
     print(f"Starting advanced scraping with {max_workers} workers...")
+    # One pooled connection per worker and host
+    default_pool.configure(max_workers)
     start_time = time.time()
     results = []
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    if hedge is not None:
+        results = scrape_urls_hedged(urls, max_workers, timeout, hedge, record_timings,
+                                     deadline)
+        print(f"Advanced scraping completed in {time.time() - start_time:.2f} seconds")
+        hedge.print_stats()
+        return results
+    
+    deadline = Deadline.from_seconds(deadline)
+    fetch = fetch_with_deadline(deadline) if deadline is not None else fetch_url
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    try:
         # Submit all tasks and get future objects
-        future_to_url = { executor.submit(fetch_url, url, timeout): url
+        future_to_url = { executor.submit(fetch, url, timeout, record_timings=record_timings): url
                          for url in urls}
+        consumed = set()
         
-        # Process results as they complete
-        for future in as_completed(future_to_url):
-            url = future_to_url[future]
+        def collect(future, url):
             try:
-                result = future.result()
-                results.append(result)
+                results.append(future.result())
                 print(f"Completed {len(results)}/{len(urls)} URLs")
             except Exception as e:
                 print(f"Exception occurred for {url}: {e}")
@@ -38,14 +60,53 @@ def scrape_urls_advanced(urls: List[str], max_workers: int = 5, timeout: int = 1
                     'success': False,
                     'error': str(e)
                 })
+        
+        # Process results as they complete
+        try:
+            for future in as_completed(future_to_url,
+                                       timeout=deadline.remaining() if deadline else None):
+                consumed.add(future)
+                collect(future, future_to_url[future])
+        except FuturesTimeoutError:
+            # Deadline passed: keep what finished (with its own error if it
+            # failed), cancel what is queued and mark the rest as timed out
+            unfinished = 0
+            for future, url in future_to_url.items():
+                if future in consumed:
+                    continue
+                if future.done() and not future.cancelled():
+                    collect(future, url)
+                else:
+                    future.cancel()
+                    unfinished += 1
+                    results.append(timed_out_result(url, time.time() - start_time))
+            print(f"Deadline of {deadline.seconds:.2f}s reached: "
+                  f"{unfinished} URLs unfinished or cancelled")
+    finally:
+        # Without a deadline this waits for every future, as the `with` block did
+        executor.shutdown(wait=deadline is None, cancel_futures=deadline is not None)
     
     total_time = time.time() - start_time
     print(f"Advanced scraping completed in {total_time:.2f} seconds")
     return results
 
 if __name__ == "__main__":
+    # Revisits send conditional requests and reuse cached bodies on 304
+    enable_http_cache()
     
     # Advanced scraping with submit() and as_completed()
     print("Advanced approach using submit() and as_completed():")
-    results= scrape_urls_advanced(urls, max_workers=3, timeout=5)
+    results= scrape_urls_advanced(urls, max_workers=3, timeout=5, record_timings=True)
+    process_results(results)
+    process_timings(results)
+    
+    # Same scrape with hedging: requests slower than 1.5s get a second copy
+    print("\nAdvanced approach with hedged requests:")
+    results = scrape_urls_advanced(urls, max_workers=3, timeout=5,
+                                   hedge=HedgePolicy(threshold=1.5, max_hedge_ratio=0.2))
+    process_results(results)
+    
+    # Whole run capped at 1.5s: slow URLs come back marked as timed out
+    print("\nAdvanced approach with an overall deadline:")
+    results = scrape_urls_advanced(urls, max_workers=3, timeout=5, deadline=1.5)
     process_results(results)
\ No newline at end of file
@@ -1,25 +1,38 @@
 from utils import *
 
-def scrape_urls_with_progress(urls: List[str], max_workers: int = 5) -> List[Dict[str, any]]:
+def scrape_urls_with_progress(urls: List[str], max_workers: int = 5,
+                              deadline: Optional[float] = None) -> List[Dict[str, any]]:
     """
     Web scraping with real-time progress updates
     
+    Workers only queue an event per result; a background ProgressReporter
+    redraws req/s, bytes/s, error rate and ETA a few times per second, so
+    threads never contend for stdout.
+    
     Args:
         urls: List of URLs to scrape
         max_workers: Maximum number of concurrent threads
+        deadline: Optional budget in seconds for the whole run. Per-request
+                  timeouts are shortened to fit and URLs not started in time
+                  come back marked with error_kind 'deadline'
     
     Returns:
         List of results for each URL
     """
     print(f"Starting scraping with progress tracking using {max_workers} workers...")
+    # One pooled connection per worker and host
+    default_pool.configure(max_workers)
     start_time = time.time()
+    deadline = Deadline.from_seconds(deadline)
+    fetch = fetch_with_deadline(deadline) if deadline is not None else fetch_url
     results = []
-    completed = 0
     
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        # Submit all tasks
+    with ThreadPoolExecutor(max_workers=max_workers) as executor, \
+            ProgressReporter(total=len(urls)) as reporter:
+        # Submit all tasks; per-fetch prints would fight the progress line
+        # for the terminal, so these fetches are quiet
         future_to_url = {
-            executor.submit(fetch_url, url): url 
+            executor.submit(fetch, url, quiet=True): url 
             for url in urls
         }
         
@@ -28,24 +41,17 @@ def scrape_urls_with_progress(urls: List[str], max_workers: int = 5) -> List[Dic
             url = future_to_url[future]
             try:
                 result = future.result()
-                results.append(result)
-                completed += 1
-                
-                # Show progress
-                progress = (completed / len(urls)) * 100
-                print(f"Progress: {progress:.1f}% ({completed}/{len(urls)}) - Latest: {url}")
-                
             except Exception as e:
-                print(f"Exception for {url}: {e}")
-                results.append({
+                result = {
                     'url': url,
                     'status': None,
                     'content_length': 0,
                     'response_time': 0,
                     'success': False,
                     'error': str(e)
-                })
-                completed += 1
+                }
+            results.append(result)
+            reporter.record(result)
     
     total_time = time.time() - start_time
     print(f"Scraping with progress completed in {total_time:.2f} seconds")
@@ -55,6 +61,8 @@ def scrape_urls_with_progress(urls: List[str], max_workers: int = 5) -> List[Dic
 
 # Example usage with different approaches
 if __name__ == "__main__":
+    # Revisits send conditional requests and reuse cached bodies on 304
+    enable_http_cache()
 
     print("Scraping with progress tracking:")
     results = scrape_urls_with_progress(urls, max_workers=3)
@@ -0,0 +1,50 @@
+from utils import *
+import itertools
+
+def scrape_urls_lazily(urls: Iterable[str], max_workers: int = 5, max_in_flight: int = 10) -> List[Dict[str, any]]:
+    """
+    Streaming web scraping with a bounded number of futures in flight
+    
+    Args:
+        urls: Iterable of URLs to scrape (can be a lazily read file)
+        max_workers: Maximum number of concurrent threads
+        max_in_flight: Maximum number of futures submitted at once
+    
+    Returns:
+        List of results for each URL
+    """
+    print(f"Starting streaming scraping with {max_workers} workers, {max_in_flight} in flight...")
+    start_time = time.time()
+    results = []
+    
+    # Results arrive as soon as each request completes; nothing is submitted
+    # until a slot in the window frees up
+    for result in scrape_urls_streaming(urls, max_workers=max_workers, max_in_flight=max_in_flight):
+        results.append(result)
+        print(f"Completed {len(results)} URLs - Latest: {result['url']}")
+    
+    total_time = time.time() - start_time
+    print(f"Streaming scraping completed in {total_time:.2f} seconds")
+    return results
+
+
+if __name__ == "__main__":
+
+    print("Streaming approach with a bounded window of futures:")
+    # A generator works just as well as a list, e.g. read_urls("urls.txt")
+    url_stream = itertools.islice(itertools.cycle(urls), 30)
+    results = scrape_urls_lazily(url_stream, max_workers=3, max_in_flight=6)
+    process_results(results)
+    
+    # Same crawl with a checkpoint: run it twice and the second run only
+    # replays stored results instead of fetching again
+    print("\nResumable approach with a SQLite checkpoint:")
+    results = list(scrape_urls_resumable(urls, "crawl_checkpoint.db", max_workers=3))
+    process_results(results)
+    
+    # Results go straight to disk in batches; nothing is kept in memory
+    print("\nStreaming to a gzip-compressed JSONL file:")
+    url_stream = itertools.islice(itertools.cycle(urls), 30)
+    stats = scrape_urls_to_sink(url_stream, JSONLSink("results.jsonl.gz", compress="gzip",
+                                                      batch_size=10), max_workers=3)
+    process_results(stats)
@@ -0,0 +1,33 @@
+from utils import *
+
+def scrape_urls_with_aimd(urls: List[str], max_workers: int = 10, timeout: int = 10) -> List[Dict[str, any]]:
+    """
+    Web scraping with adaptive per-host concurrency (AIMD)
+    
+    Args:
+        urls: List of URLs to scrape
+        max_workers: Maximum number of concurrent threads across all hosts
+        timeout: Request timeout for each URL
+    
+    Returns:
+        List of results for each URL
+    """
+    print(f"Starting adaptive scraping with up to {max_workers} workers...")
+    start_time = time.time()
+    
+    # Each host starts at 2 requests in flight and grows or shrinks on its own
+    controller = AIMDController(initial=2, max_limit=max_workers)
+    results = scrape_urls_adaptive(urls, max_workers=max_workers, timeout=timeout,
+                                   controller=controller)
+    
+    total_time = time.time() - start_time
+    print(f"Adaptive scraping completed in {total_time:.2f} seconds")
+    controller.print_snapshot()
+    return results
+
+
+if __name__ == "__main__":
+
+    print("Adaptive approach with per-host AIMD limits:")
+    results = scrape_urls_with_aimd(urls * 3, max_workers=6, timeout=5)
+    process_results(results)
@@ -0,0 +1,11 @@
+from utils import *
+from async_engine import scrape_urls_async
+
+
+if __name__ == "__main__":
+
+    # Same results and the same process_results as the thread-pool scripts,
+    # but a single event loop drives all the connections
+    print("Asyncio engine behind the threaded scraper API:")
+    results = scrape_urls_async(urls, concurrency=100, timeout=5)
+    process_results(results)
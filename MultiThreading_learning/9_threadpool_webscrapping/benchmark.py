@@ -0,0 +1,146 @@
+import argparse
+import asyncio
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+from utils import *
+from async_engine import scrape_urls_async_engine
+from local_httpbin import LocalHttpBin
+
+"""
+Scraper Benchmark Suite
+- Starts a LocalHttpBin server, so numbers do not depend on the internet.
+- Runs the sequential, thread-pool, asyncio and multiprocessing scrapers
+  over a matrix of concurrency levels and payload sizes.
+- Reports throughput and latency percentiles for every cell as JSON.
+
+Usage:
+    python benchmark.py --requests 200 --concurrency 1 8 32 --payloads 1024 65536
+"""
+
+
+def run_sequential(urls: List[str], concurrency: int) -> List[Dict[str, any]]:
+    return [fetch_url(url) for url in urls]
+
+
+def run_thread_pool(urls: List[str], concurrency: int) -> List[Dict[str, any]]:
+    return list(scrape_urls_streaming(urls, max_workers=concurrency))
+
+
+def run_asyncio(urls: List[str], concurrency: int) -> List[Dict[str, any]]:
+    return asyncio.run(scrape_urls_async_engine(urls, concurrency=concurrency))
+
+
+def _silence_worker() -> None:
+    sys.stdout = open(os.devnull, "w")
+
+
+def run_multiprocessing(urls: List[str], concurrency: int) -> List[Dict[str, any]]:
+    # One process per unit of concurrency is wasteful past a few per core
+    processes = max(1, min(concurrency, 4 * multiprocessing.cpu_count()))
+    chunksize = max(1, len(urls) // (processes * 4))
+    with multiprocessing.Pool(processes=processes, initializer=_silence_worker) as pool:
+        return list(pool.imap_unordered(fetch_url, urls, chunksize=chunksize))
+
+
+ENGINES: Dict[str, Callable[[List[str], int], List[Dict[str, any]]]] = {
+    'sequential': run_sequential,
+    'thread_pool': run_thread_pool,
+    'asyncio': run_asyncio,
+    'multiprocessing': run_multiprocessing,
+}
+
+
+def benchmark_cell(engine: str, urls: List[str], concurrency: int) -> Dict[str, any]:
+    """
+    Run one engine once and summarize it
+
+    Returns:
+        Dict with throughput, latency percentiles and error count
+    """
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        results = ENGINES[engine](urls, concurrency)
+        elapsed = time.perf_counter() - start
+    stats = ResultAggregator().add_all(results)
+    return {
+        'engine': engine,
+        'concurrency': concurrency,
+        'requests': len(urls),
+        'elapsed': elapsed,
+        'throughput_rps': len(urls) / elapsed if elapsed else 0.0,
+        'bytes_per_sec': stats.total_bytes / elapsed if elapsed else 0.0,
+        'p50': stats.latency.percentile(50),
+        'p95': stats.latency.percentile(95),
+        'p99': stats.latency.percentile(99),
+        'errors': stats.failed,
+    }
+
+
+def run_benchmarks(requests_per_cell: int = 200, concurrency_levels=(1, 8, 32),
+                   payloads=(1024, 65536), engines=tuple(ENGINES),
+                   latency: float = 0.02, error_rate: float = 0.0) -> Dict[str, any]:
+    """
+    Run every engine across the concurrency x payload matrix
+
+    The sequential engine ignores concurrency, so it runs once per payload.
+
+    Args:
+        requests_per_cell: Requests issued for each matrix cell
+        concurrency_levels: Workers / coroutines / processes to try
+        payloads: Response sizes in bytes (served from /bytes/N)
+        engines: Engine names from ENGINES
+        latency: Server-side delay added to every response
+        error_rate: Share of responses the server turns into 500/503
+
+    Returns:
+        Dict with the run configuration and one record per cell
+    """
+    records = []
+    with LocalHttpBin(latency=latency, error_rate=error_rate) as server:
+        for payload in payloads:
+            urls = [server.url(f"/bytes/{payload}")] * requests_per_cell
+            for engine in engines:
+                levels = (1,) if engine == 'sequential' else concurrency_levels
+                for concurrency in levels:
+                    record = benchmark_cell(engine, urls, concurrency)
+                    record['payload_bytes'] = payload
+                    records.append(record)
+                    print(f"{engine:<16} c={concurrency:<4} payload={payload:<8} "
+                          f"{record['throughput_rps']:8.1f} req/s  p95 {record['p95'] * 1000:7.1f}ms",
+                          file=sys.stderr)
+    return {
+        'config': {
+            'requests_per_cell': requests_per_cell,
+            'concurrency_levels': list(concurrency_levels),
+            'payloads': list(payloads),
+            'server_latency': latency,
+            'server_error_rate': error_rate,
+        },
+        'results': records,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the scraper engines against a local server")
+    parser.add_argument("--requests", type=int, default=200, help="requests per matrix cell")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--payloads", type=int, nargs="+", default=[1024, 65536])
+    parser.add_argument("--engines", nargs="+", choices=list(ENGINES), default=list(ENGINES))
+    parser.add_argument("--latency", type=float, default=0.02, help="server latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--output", help="write JSON here instead of stdout")
+    args = parser.parse_args()
+
+    report = run_benchmarks(args.requests, args.concurrency, args.payloads, args.engines,
+                            args.latency, args.error_rate)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
@@ -0,0 +1,228 @@
+import itertools
+import queue
+import sqlite3
+from contextlib import closing
+import threading
+import time
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Set
+
+from result_stats import ScrapeResult
+
+"""
+Crawl Checkpoint Example
+- Finished URLs and their results are stored in a SQLite file, so a crashed
+  or preempted run can resume instead of starting over.
+- record() only puts the result on a queue; a background writer thread
+  commits them in batches (by count or by time), so neither the workers nor
+  the result loop ever wait on the disk.
+- On restart, completed_urls() says which of a batch of URLs to skip and
+  replay() feeds their stored results back into process_results; both look
+  URLs up in the database, so no set of all URLs is held in memory.
+- Results are keyed by URL: a URL listed twice is stored once, with the
+  result recorded last.
+- Use one database file per job: results of unrelated URL lists would be
+  replayed as if they belonged to this one.
+"""
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    url TEXT PRIMARY KEY,
+    status INTEGER,
+    content_length INTEGER,
+    response_time REAL,
+    success INTEGER,
+    error TEXT,
+    error_kind TEXT,
+    finished_at REAL
+)
+"""
+
+_COLUMNS = ('url', 'status', 'content_length', 'response_time', 'success', 'error', 'error_kind')
+
+_STOP = object()
+
+# Bound on URLs per SELECT ... IN (...), below SQLite's variable limit
+_LOOKUP_CHUNK = 500
+
+
+class CheckpointStore:
+    """
+    SQLite-backed record of finished URLs with a batching background writer
+
+    Usage:
+        with CheckpointStore("crawl.db") as store:
+            done = store.completed_urls(batch)
+            for result in scrape_urls_streaming(u for u in batch if u not in done):
+                store.record(result)
+    """
+
+    def __init__(self, path: str, batch_size: int = 500, flush_interval: float = 2.0):
+        """
+        Args:
+            path: SQLite database file, one per job
+            batch_size: Results committed per transaction
+            flush_interval: Maximum seconds a result waits before being committed
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        # sqlite3's own context manager only commits; closing() closes too
+        with closing(sqlite3.connect(path)) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self.written = 0
+
+    def lookup(self, urls: Iterable[str], include_failed: bool = True) -> Dict[str, ScrapeResult]:
+        """
+        Stored results for the given URLs (one query per 500 URLs)
+
+        Args:
+            urls: URLs to look up, e.g. the next batch of the input
+            include_failed: Also return failed results (False retries them)
+
+        Returns:
+            Mapping of URL -> stored result for the URLs that are done
+        """
+        urls = list(dict.fromkeys(urls))
+        found = {}
+        with closing(sqlite3.connect(self.path)) as conn:
+            for start in range(0, len(urls), _LOOKUP_CHUNK):
+                chunk = urls[start:start + _LOOKUP_CHUNK]
+                query = (f"SELECT {', '.join(_COLUMNS)} FROM results "
+                         f"WHERE url IN ({', '.join('?' * len(chunk))})")
+                if not include_failed:
+                    query += " AND success = 1"
+                for url, status, length, response_time, success, error, kind in conn.execute(
+                        query, chunk):
+                    result = ScrapeResult(url, status, length, response_time, bool(success), error)
+                    if kind is not None:
+                        result.error_kind = kind
+                    found[url] = result
+        return found
+
+    def completed_urls(self, urls: Iterable[str], include_failed: bool = True) -> Set[str]:
+        """
+        Args:
+            urls: URLs to check, e.g. the next batch of the input
+            include_failed: Also count failed URLs as done (False retries them)
+
+        Returns:
+            Those of urls that need not be fetched again
+        """
+        return set(self.lookup(urls, include_failed))
+
+    def replay(self, urls: Iterable[str], include_failed: bool = True,
+               batch_size: int = _LOOKUP_CHUNK) -> Iterator[ScrapeResult]:
+        """
+        Yield the stored results of this run's URLs, in input order
+
+        URLs without a stored result (and rows of URLs that are not in urls)
+        are skipped. urls is read batch_size at a time.
+        """
+        url_iter = iter(urls)
+        while True:
+            batch = list(itertools.islice(url_iter, batch_size))
+            if not batch:
+                return
+            found = self.lookup(batch, include_failed)
+            for url in batch:
+                if url in found:
+                    yield found[url]
+
+    def record(self, result: Mapping) -> None:
+        """
+        Queue a finished result for the writer thread (never blocks on I/O)
+
+        Raises:
+            RuntimeError: If the writer thread has failed
+        """
+        self._raise_if_failed()
+        self._queue.put(tuple(result.get(name) for name in _COLUMNS) + (time.time(),))
+
+    def flush(self) -> None:
+        """
+        Wait until everything recorded so far is committed
+
+        Raises:
+            RuntimeError: If the writer thread has failed
+        """
+        if self._thread is not None:
+            committed = threading.Event()
+            self._queue.put(committed)
+            committed.wait()
+        self._raise_if_failed()
+
+    def _raise_if_failed(self) -> None:
+        if self._error is not None:
+            raise RuntimeError("Checkpoint writer failed") from self._error
+
+    def _writer(self) -> None:
+        conn = None
+        stopping = False
+        flushed = []
+        try:
+            conn = sqlite3.connect(self.path)
+            while not stopping:
+                batch = []
+                flushed = []
+                flush_at = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    if isinstance(item, threading.Event):
+                        flushed.append(item)  # flush(): commit now
+                        break
+                    batch.append(item)
+                if batch:
+                    with conn:  # One transaction per batch
+                        conn.executemany(
+                            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)", batch)
+                    self.written += len(batch)
+                for event in flushed:
+                    event.set()
+        except BaseException as e:
+            self._error = e
+            for event in flushed:
+                event.set()
+            # Keep draining so flush() callers are released, until close()
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                if isinstance(item, threading.Event):
+                    item.set()
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def start(self) -> "CheckpointStore":
+        self._thread = threading.Thread(target=self._writer, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """
+        Flush everything queued so far and stop the writer
+
+        Raises:
+            RuntimeError: If the writer thread has failed
+        """
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        self._raise_if_failed()
+
+    def __enter__(self) -> "CheckpointStore":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
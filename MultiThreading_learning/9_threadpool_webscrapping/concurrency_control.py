@@ -0,0 +1,160 @@
+import threading
+import time
+from typing import Dict, Mapping, Optional
+from urllib.parse import urlsplit
+
+"""
+Adaptive Concurrency (AIMD) Example
+- Every host has its own in-flight limit instead of sharing max_workers.
+- Healthy responses raise the limit additively (about +1 per window of
+  `limit` requests), like TCP congestion avoidance.
+- Timeouts, 429 and 5xx answers cut it multiplicatively, at most once per
+  window, so a burst of failures from one overload only counts once.
+- A slow host therefore keeps few threads busy while fast hosts get more.
+"""
+
+# Overload statuses below 500; any 5xx counts as overload as well
+OVERLOAD_STATUSES = {429}
+
+
+def is_overload(result: Mapping) -> bool:
+    """
+    Decide whether a result signals that the host is overloaded
+
+    Args:
+        result: Result from fetch_url
+
+    Returns:
+        True for timeouts, 429 and 5xx responses
+    """
+    status = result.get('status')
+    return (result.get('error_kind') == 'timeout'
+            or status in OVERLOAD_STATUSES
+            or (status is not None and status >= 500))
+
+
+class HostLimit:
+    """AIMD state for a single host"""
+
+    __slots__ = ('limit', 'in_flight', 'baseline', 'last_decrease',
+                 'successes', 'overloads')
+
+    def __init__(self, initial: float):
+        self.limit = initial
+        self.in_flight = 0
+        self.baseline: Optional[float] = None
+        self.last_decrease = 0.0
+        self.successes = 0
+        self.overloads = 0
+
+
+class AIMDController:
+    """
+    Per-host additive-increase / multiplicative-decrease concurrency limits
+
+    try_acquire() never blocks: the dispatcher only hands a URL to the thread
+    pool when its host has room, so no worker thread sits waiting on a slow
+    host.
+    """
+
+    def __init__(self, initial: float = 2, min_limit: float = 1, max_limit: float = 32,
+                 increase: float = 1.0, decrease_factor: float = 0.5,
+                 latency_tolerance: float = 3.0):
+        """
+        Args:
+            initial: Starting in-flight limit for a newly seen host
+            min_limit: Lowest limit a host can be cut down to
+            max_limit: Highest limit a host can grow to
+            increase: Additive step per window of successful requests
+            decrease_factor: Multiplier applied on overload (0 < f < 1)
+            latency_tolerance: Latency above tolerance * best latency seen
+                               is treated as a warning: the limit stops growing
+        """
+        self.initial = initial
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self._hosts: Dict[str, HostLimit] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).hostname or ""
+
+    def _state(self, host: str) -> HostLimit:
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostLimit(self.initial)
+        return state
+
+    def try_acquire(self, url: str) -> Optional[float]:
+        """
+        Reserve an in-flight slot for url's host if one is free
+
+        Returns:
+            Start timestamp to hand back to release(), or None if the host is
+            at its limit
+        """
+        with self._lock:
+            state = self._state(self.host_of(url))
+            if state.in_flight >= int(state.limit):
+                return None
+            state.in_flight += 1
+            return time.monotonic()
+
+    def release(self, url: str, started: float, result: Mapping) -> None:
+        """
+        Free the slot and adjust the host's limit from the outcome
+
+        Args:
+            url: URL that was fetched
+            started: Value returned by try_acquire()
+            result: Result from fetch_url
+        """
+        with self._lock:
+            state = self._state(self.host_of(url))
+            state.in_flight -= 1
+            if is_overload(result):
+                state.overloads += 1
+                # Requests started before the last cut were already counted
+                if started >= state.last_decrease:
+                    state.limit = max(self.min_limit, state.limit * self.decrease_factor)
+                    state.last_decrease = time.monotonic()
+                return
+            if not result.get('success'):
+                return  # 404 and friends say nothing about load
+
+            latency = result.get('response_time', 0.0)
+            state.successes += 1
+            if state.baseline is None or latency < state.baseline:
+                state.baseline = latency
+            if latency <= max(state.baseline * self.latency_tolerance, 0.05):
+                # +increase spread over one window of `limit` requests
+                state.limit = min(self.max_limit, state.limit + self.increase / state.limit)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """
+        Current limits for monitoring
+
+        Returns:
+            Mapping of host -> limit, in_flight, baseline latency, counters
+        """
+        with self._lock:
+            return {
+                host: {
+                    'limit': state.limit,
+                    'in_flight': state.in_flight,
+                    'baseline_latency': state.baseline or 0.0,
+                    'successes': state.successes,
+                    'overloads': state.overloads,
+                }
+                for host, state in self._hosts.items()
+            }
+
+    def print_snapshot(self) -> None:
+        print(f"\n=== HOST CONCURRENCY LIMITS ===")
+        for host, state in self.snapshot().items():
+            print(f"  {host}: limit {state['limit']:.2f}, in flight {state['in_flight']}, "
+                  f"{state['successes']} ok, {state['overloads']} overloaded")
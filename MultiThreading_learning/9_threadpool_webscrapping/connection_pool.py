@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from request_timing import TimedHTTPAdapter
+
+"""
+Connection Pool Example
+- Share one requests.Session across all worker threads so TCP/TLS
+  connections are reused instead of opened for every URL.
+- Size the per-host pool to the ThreadPoolExecutor's max_workers.
+- Evict connections to hosts that have been idle for too long.
+"""
+
+
+class ConnectionPoolManager:
+    """
+    Thread-safe manager around a shared requests.Session with keep-alive pools
+
+    The urllib3 PoolManager behind the session is thread-safe, so one session
+    is shared by every worker. Each host gets its own pool holding up to
+    `pool_maxsize` connections; with pool_block=True a worker waits for a free
+    connection instead of opening (and then throwing away) an extra one.
+    """
+
+    def __init__(self, max_workers: int = 5, max_hosts: int = 10,
+                 idle_timeout: float = 30.0):
+        """
+        Args:
+            max_workers: Number of worker threads, used as the per-host pool size
+            max_hosts: Number of per-host pools to keep
+            idle_timeout: Seconds a host's pool may sit unused before it is closed
+        """
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._last_used: Dict[str, float] = {}
+        self._last_eviction = time.monotonic()
+        self._pool_maxsize = 0
+        self._max_hosts = max_hosts
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self.configure(max_workers)
+
+    def configure(self, max_workers: int) -> None:
+        """
+        Resize the per-host pools to match the number of worker threads
+
+        The pool is only ever grown, so a smaller executor running next to a
+        bigger one never shrinks the bigger one's connections away.
+
+        Args:
+            max_workers: Maximum number of concurrent threads using the pool
+        """
+        with self._lock:
+            if self._session is not None and max_workers <= self._pool_maxsize:
+                return
+            # Timed adapter: records per-phase timings for requests that ask for them
+            adapter = TimedHTTPAdapter(pool_connections=self._max_hosts,
+                                       pool_maxsize=max_workers,
+                                       pool_block=True)
+            session = requests.Session()
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            old_session = self._session
+            self._session = session
+            self._adapter = adapter
+            self._pool_maxsize = max_workers
+        # In-flight requests on the old session finish on their own connections
+        if old_session is not None:
+            old_session.close()
+
+    @property
+    def session(self) -> requests.Session:
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        Issue a GET over a pooled, keep-alive connection
+
+        Args:
+            url: URL to fetch
+            **kwargs: Passed through to requests.Session.get
+
+        Returns:
+            The requests.Response object
+        """
+        now = time.monotonic()
+        host = urlsplit(url).hostname or ""
+        # Plain dict assignment is atomic, so the hot path takes no lock
+        self._last_used[host] = now
+        if now - self._last_eviction > self.idle_timeout:
+            self.evict_idle(now)
+        return self._session.get(url, **kwargs)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """
+        Close pools for hosts that have not been used within idle_timeout
+
+        Args:
+            now: Current monotonic time (defaults to time.monotonic())
+
+        Returns:
+            Number of host pools that were closed
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._last_eviction = now
+            idle_hosts = {host for host, last in list(self._last_used.items())
+                          if now - last > self.idle_timeout}
+            if not idle_hosts:
+                return 0
+            pools = self._adapter.poolmanager.pools
+            evicted = 0
+            for key in pools.keys():
+                if key.key_host in idle_hosts:
+                    del pools[key]  # The container closes the pool on removal
+                    evicted += 1
+            for host in idle_hosts:
+                self._last_used.pop(host, None)
+            return evicted
+
+    def stats(self) -> Dict[str, any]:
+        """
+        Return the current pool configuration and the number of open host pools
+        """
+        return {
+            'pool_maxsize': self._pool_maxsize,
+            'open_host_pools': len(self._adapter.poolmanager.pools),
+            'tracked_hosts': len(self._last_used),
+        }
+
+    def _reset_after_fork(self) -> None:
+        """
+        Give a forked child its own session; sockets inherited from the parent
+        must not be shared between processes (nor closed, which would affect
+        the parent's TLS state)
+        """
+        self._lock = threading.Lock()
+        self._last_used = {}
+        maxsize, self._pool_maxsize, self._session = self._pool_maxsize, 0, None
+        self.configure(maxsize)
+
+    def close(self) -> None:
+        """Close every pooled connection"""
+        with self._lock:
+            self._session.close()
+            self._last_used.clear()
+
+
+# Shared pool used by fetch_url and the scrape_urls_* functions
+default_pool = ConnectionPoolManager()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=default_pool._reset_after_fork)
@@ -0,0 +1,47 @@
+import time
+from typing import Optional
+
+"""
+Deadline Example
+- A Deadline is an absolute point on the monotonic clock for the whole run.
+- Scrapers stop submitting work once it has passed and cancel whatever is
+  still queued.
+- Each request's timeout is clamped to the time that is left, so an
+  in-flight request cannot keep the job running long past its slot.
+"""
+
+
+class Deadline:
+    """Overall time budget for a scraping run"""
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Budget for the whole run, starting now
+        """
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def from_seconds(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """Build a Deadline, passing None (no deadline) straight through"""
+        return None if seconds is None else cls(seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def clamp(self, timeout: float, minimum: float = 0.1) -> float:
+        """
+        Shorten a per-request timeout so it ends no later than the deadline
+
+        Args:
+            timeout: Requested per-request timeout in seconds
+            minimum: Floor, so a request started just before the deadline
+                     does not get a zero timeout (which means "no timeout")
+        """
+        return max(minimum, min(timeout, self.remaining()))
@@ -0,0 +1,259 @@
+import socket
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+"""
+DNS Cache Example
+- Cache socket.getaddrinfo() answers in-process so many threads hitting a
+  handful of hosts resolve each host once per TTL instead of once per request.
+- Failed lookups are cached too (negative caching, shorter TTL), so a dead
+  hostname does not hammer the resolver.
+- Concurrent misses for the same host wait for one lookup instead of all
+  resolving at once.
+- Used by the pooled requests session (see request_timing.py) and, through
+  CachedResolver, by aiohttp:
+      aiohttp.TCPConnector(resolver=CachedResolver(), use_dns_cache=False)
+- Lookups go through the system resolver, so /etc/hosts entries (e.g.
+  localhost) work offline. A hosts_file (same format) is consulted first,
+  which overrides names without touching /etc/hosts; run this module to
+  check it against a temporary hosts file:
+      python dns_cache.py
+"""
+
+
+class _Entry:
+    __slots__ = ('expires', 'addresses', 'error')
+
+    def __init__(self, expires: float, addresses=None, error: Optional[socket.gaierror] = None):
+        self.expires = expires
+        self.addresses = addresses
+        self.error = error
+
+
+class DNSCache:
+    """
+    Thread-safe, TTL-based cache in front of socket.getaddrinfo
+    """
+
+    def __init__(self, ttl: float = 300.0, negative_ttl: float = 30.0, max_entries: int = 10000,
+                 resolver=socket.getaddrinfo, hosts_file: Optional[str] = None):
+        """
+        Args:
+            ttl: Seconds a successful answer is reused
+            negative_ttl: Seconds a failed lookup is remembered
+            max_entries: Entries kept before expired ones are purged
+            resolver: Function with the socket.getaddrinfo signature
+            hosts_file: Optional file in /etc/hosts format whose names are
+                        answered from it instead of the resolver
+        """
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.resolver = resolver
+        self.hosts = self._read_hosts(hosts_file) if hosts_file else {}
+        self._entries: Dict[Tuple, _Entry] = {}
+        self._inflight: Dict[Tuple, threading.Event] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.negative_hits = 0
+
+    @staticmethod
+    def _read_hosts(path: str) -> Dict[str, List[str]]:
+        """Parse a hosts file into name -> addresses (in file order)"""
+        hosts: Dict[str, List[str]] = {}
+        with open(path) as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                if len(fields) < 2:
+                    continue
+                for name in fields[1:]:
+                    hosts.setdefault(name.lower(), []).append(fields[0])
+        return hosts
+
+    def _resolve(self, host: str, port, family: int, type: int, proto: int, flags: int) -> List[Tuple]:
+        addresses = self.hosts.get(host.lower())
+        if addresses is None:
+            return self.resolver(host, port, family, type, proto, flags)
+        infos = []
+        for address in addresses:
+            try:
+                # Numeric lookup: formats the answer, never leaves the process
+                infos.extend(socket.getaddrinfo(address, port, family, type, proto,
+                                                socket.AI_NUMERICHOST))
+            except socket.gaierror:
+                continue  # e.g. an IPv6 entry when family is AF_INET
+        if not infos:
+            raise socket.gaierror(socket.EAI_NONAME, f"No usable address for {host} in hosts file")
+        return infos
+
+    def peek(self, host: str, port, family: int = 0, type: int = 0,
+             proto: int = 0, flags: int = 0) -> Optional[List[Tuple]]:
+        """
+        Cached addresses if a fresh successful answer is stored, else None
+
+        Never resolves or waits for a lookup, so it is safe to call from an
+        event loop; a hit is counted like a getaddrinfo() hit.
+        """
+        key = (host, port, family, type, proto, flags)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry.error is not None or entry.expires <= time.monotonic():
+                return None
+            self.hits += 1
+            return entry.addresses
+
+    def getaddrinfo(self, host: str, port, family: int = 0, type: int = 0,
+                    proto: int = 0, flags: int = 0) -> List[Tuple]:
+        """
+        Drop-in replacement for socket.getaddrinfo
+
+        Raises:
+            socket.gaierror: For failed lookups, including cached failures
+        """
+        key = (host, port, family, type, proto, flags)
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry.expires > time.monotonic():
+                    if entry.error is not None:
+                        self.negative_hits += 1
+                        raise entry.error
+                    self.hits += 1
+                    return entry.addresses
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    # This thread resolves; the others wait for its answer
+                    self._inflight[key] = threading.Event()
+                    self.misses += 1
+                    break
+            waiter.wait()
+
+        try:
+            addresses = self._resolve(host, port, family, type, proto, flags)
+            entry = _Entry(time.monotonic() + self.ttl, addresses=addresses)
+        except socket.gaierror as e:
+            entry = _Entry(time.monotonic() + self.negative_ttl, error=e)
+        except BaseException:
+            with self._lock:
+                self._inflight.pop(key).set()
+            raise
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._purge_expired()
+            self._entries[key] = entry
+            self._inflight.pop(key).set()
+        if entry.error is not None:
+            raise entry.error
+        return entry.addresses
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, e in self._entries.items() if e.expires <= now]:
+            del self._entries[key]
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        """Forget one host (or everything)"""
+        with self._lock:
+            if host is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == host]:
+                    del self._entries[key]
+
+    def stats(self) -> Dict[str, any]:
+        with self._lock:
+            lookups = self.hits + self.misses + self.negative_hits
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'negative_hits': self.negative_hits,
+                'hit_ratio': (self.hits + self.negative_hits) / lookups if lookups else 0.0,
+                'entries': len(self._entries),
+            }
+
+
+# Shared by the pooled requests session
+default_dns_cache = DNSCache()
+
+
+try:
+    import asyncio
+    from aiohttp.abc import AbstractResolver
+
+    class CachedResolver(AbstractResolver):
+        """
+        aiohttp resolver backed by a DNSCache
+
+        Hits are answered without leaving the event loop; misses run the
+        blocking lookup in the default thread pool.
+        """
+
+        def __init__(self, cache: Optional[DNSCache] = None):
+            self.cache = cache if cache is not None else default_dns_cache
+
+        async def resolve(self, host: str, port: int = 0, family: int = socket.AF_INET):
+            key = (host, port, family, socket.SOCK_STREAM, 0, socket.AI_ADDRCONFIG)
+            infos = self.cache.peek(*key)
+            if infos is None:
+                loop = asyncio.get_running_loop()
+                try:
+                    infos = await loop.run_in_executor(None, self.cache.getaddrinfo, *key)
+                except socket.gaierror as e:
+                    raise OSError(e.errno, f"DNS lookup failed for {host}") from e
+            return [
+                {
+                    'hostname': host,
+                    'host': address[0],
+                    'port': address[1],
+                    'family': af,
+                    'proto': proto,
+                    'flags': socket.AI_NUMERICHOST | socket.AI_NUMERICSERV,
+                }
+                for af, _, proto, _, address in infos
+            ]
+
+        async def close(self) -> None:
+            pass
+
+except ImportError:  # aiohttp is optional for the thread-based scrapers
+    CachedResolver = None
+
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+
+    # Offline check of the hosts-file override: names that exist nowhere else
+    with tempfile.NamedTemporaryFile("w", suffix=".hosts", delete=False) as f:
+        f.write("# test hosts\n127.0.0.1   scraper-test.invalid  alias.invalid\n"
+                "::1         scraper-test.invalid\n")
+    try:
+        cache = DNSCache(hosts_file=f.name, negative_ttl=60)
+        v4 = cache.getaddrinfo("scraper-test.invalid", 80, socket.AF_INET, socket.SOCK_STREAM)
+        assert [info[4][0] for info in v4] == ["127.0.0.1"], v4
+        assert cache.getaddrinfo("scraper-test.invalid", 80, socket.AF_INET, socket.SOCK_STREAM) is v4
+        assert cache.peek("scraper-test.invalid", 80, socket.AF_INET, socket.SOCK_STREAM) is v4
+        assert cache.peek("alias.invalid", 80) is None  # Not looked up yet
+        both = {info[4][0] for info in cache.getaddrinfo("ALIAS.invalid", 80)}
+        assert both == {"127.0.0.1"}, both
+        both = {info[4][0] for info in cache.getaddrinfo("scraper-test.invalid", 443)}
+        assert "127.0.0.1" in both, both
+        for _ in range(2):  # Second failure comes from the negative cache
+            try:
+                cache.getaddrinfo("missing.invalid", 80)
+                raise AssertionError("missing.invalid resolved")
+            except socket.gaierror:
+                pass
+        stats = cache.stats()
+        assert (stats['hits'], stats['negative_hits']) == (2, 1), stats
+        if CachedResolver is not None:
+            hosts = asyncio.run(CachedResolver(cache).resolve("scraper-test.invalid", 80))
+            assert [h['host'] for h in hosts] == ["127.0.0.1"], hosts
+            stats = cache.stats()
+        print(f"Hosts-file override OK: {stats}")
+    finally:
+        os.remove(f.name)
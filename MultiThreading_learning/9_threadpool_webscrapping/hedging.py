@@ -0,0 +1,96 @@
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional
+
+"""
+Hedged Requests Example
+- When a request has been running longer than a threshold, send a duplicate
+  and take whichever answer arrives first; the loser is cancelled if it has
+  not started yet, or its result is discarded.
+- The threshold is either fixed or the live p95 of recent latencies, so only
+  the slowest ~5% of requests are hedged.
+- max_hedge_ratio bounds the extra load (e.g. at most 10% more requests).
+"""
+
+
+class HedgePolicy:
+    """
+    Decides when to hedge and keeps hedge statistics
+
+    Thread-safe; the scraper's dispatch loop calls threshold()/try_hedge()
+    and record_latency() is cheap enough to call for every completed request.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, percentile: float = 95,
+                 max_hedge_ratio: float = 0.1, window: int = 500, min_samples: int = 20,
+                 initial_threshold: float = 1.0):
+        """
+        Args:
+            threshold: Fixed hedge delay in seconds; None uses the live percentile
+            percentile: Percentile of recent latencies used as the live threshold
+            max_hedge_ratio: Maximum hedges per primary request (0.1 -> +10% load)
+            window: Number of recent latencies the live percentile is computed from
+            min_samples: Latencies needed before the live percentile is trusted
+            initial_threshold: Delay used until min_samples latencies were seen
+        """
+        self.fixed_threshold = threshold
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.initial_threshold = initial_threshold
+        self._latencies = deque(maxlen=window)
+        self._cached_threshold: Optional[float] = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hedges_fired = 0
+        self.hedges_won = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+
+    def record_latency(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+            self._cached_threshold = None
+
+    def threshold(self) -> float:
+        """Current hedge delay in seconds"""
+        if self.fixed_threshold is not None:
+            return self.fixed_threshold
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return self.initial_threshold
+            if self._cached_threshold is None:
+                # Sorting a few hundred floats only happens after new samples
+                ordered = sorted(self._latencies)
+                rank = max(0, math.ceil(len(ordered) * self.percentile / 100) - 1)
+                self._cached_threshold = ordered[rank]
+            return self._cached_threshold
+
+    def try_hedge(self) -> bool:
+        """Reserve a hedge if the extra-load cap allows it"""
+        with self._lock:
+            if self.hedges_fired + 1 > self.max_hedge_ratio * max(1, self.requests):
+                return False
+            self.hedges_fired += 1
+            return True
+
+    def record_win(self) -> None:
+        with self._lock:
+            self.hedges_won += 1
+
+    def stats(self) -> Dict[str, any]:
+        return {
+            'requests': self.requests,
+            'hedges_fired': self.hedges_fired,
+            'hedges_won': self.hedges_won,
+            'hedge_rate': self.hedges_fired / self.requests if self.requests else 0.0,
+            'threshold': self.threshold(),
+        }
+
+    def print_stats(self) -> None:
+        stats = self.stats()
+        print(f"Hedges fired: {stats['hedges_fired']} ({stats['hedge_rate']:.1%} of requests), "
+              f"won: {stats['hedges_won']}, threshold: {stats['threshold']:.2f}s")
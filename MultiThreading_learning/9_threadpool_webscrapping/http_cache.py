@@ -0,0 +1,321 @@
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+"""
+Conditional HTTP Cache Example
+- Store response bodies plus their validators (ETag / Last-Modified) on disk.
+- Revisit a URL with If-None-Match / If-Modified-Since; a 304 is served from
+  the stored body, so nothing but headers crosses the network.
+- Keep the cache under max_bytes by evicting the least recently used entries.
+- The in-memory index is guarded by one lock held only for dict operations;
+  all file I/O happens outside it, so workers never queue behind the disk.
+- Disk errors (full disk, unwritable directory) never fail a fetch: the
+  entry is skipped and the response is served uncached.
+"""
+
+
+class CacheReadError(OSError):
+    """A cached body failed to read after part of it reached the sink"""
+
+
+class HTTPCache:
+    """
+    Size-bounded, on-disk LRU cache keyed by URL
+
+    Each entry is two files named after the SHA-256 of the URL:
+    `<key>.body` with the raw body and `<key>.json` with its metadata.
+    """
+
+    def __init__(self, directory: str = ".http_cache", max_bytes: int = 100 * 1024 * 1024):
+        """
+        Args:
+            directory: Directory holding the cached entries
+            max_bytes: Maximum total size of cached bodies
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: "OrderedDict[str, Dict[str, any]]" = OrderedDict()
+        self._total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bytes_saved = 0
+        self.errors = 0
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+
+    def _path(self, key: str, suffix: str) -> str:
+        return os.path.join(self.directory, key + suffix)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode()).hexdigest()
+
+    def _load_index(self) -> None:
+        """
+        Rebuild the LRU order from the metadata files left by earlier runs,
+        dropping temp files of interrupted writes and trimming to max_bytes
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            if name.startswith("tmp-"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+                continue
+            if not name.endswith(".json"):
+                continue
+            try:
+                with open(path) as f:
+                    meta = json.load(f)
+                entries.append((os.path.getmtime(path), meta))
+            except (OSError, ValueError):
+                continue
+        for _, meta in sorted(entries, key=lambda item: item[0]):
+            self._index[meta['key']] = meta
+            self._total_bytes += meta['size']
+        # max_bytes may be smaller than in the run that filled the cache
+        with self._lock:
+            victims = self._evict(keep=0)
+        for key in victims:
+            self._remove_files(key)
+
+    def lookup(self, url: str) -> Optional[Dict[str, any]]:
+        """
+        Return the cached metadata for url and mark it most recently used
+
+        Args:
+            url: URL about to be fetched
+
+        Returns:
+            Metadata dict (etag, last_modified, size, ...) or None on a miss
+        """
+        key = self._key(url)
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                self.misses += 1
+                return None
+            self._index.move_to_end(key)
+            return meta
+
+    @staticmethod
+    def conditional_headers(meta: Dict[str, any]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers from cached validators"""
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def replay(self, meta: Dict[str, any], sink=None, chunk_size: int = 64 * 1024) -> Optional[int]:
+        """
+        Serve a cached body after the server answered 304 Not Modified
+
+        Args:
+            meta: Metadata returned by lookup()
+            sink: Optional file-like object or callable receiving body chunks
+            chunk_size: Bytes read per iteration
+
+        Returns:
+            Body size in bytes, or None if the entry was evicted meanwhile
+            or is unreadable (the caller then fetches it again); nothing has
+            been written to sink in that case
+
+        Raises:
+            CacheReadError: If reading fails after part of the body was
+                            already written to sink
+        """
+        write = getattr(sink, 'write', sink)
+        try:
+            f = open(self._path(meta['key'], ".body"), "rb")
+        except FileNotFoundError:
+            return None
+        except OSError:
+            self._failed()
+            return None
+        with f:
+            try:
+                # A truncated body (e.g. a disk error) must not be served
+                complete = os.fstat(f.fileno()).st_size == meta['size']
+            except OSError:
+                complete = False
+            if not complete:
+                self._failed()
+                self._discard(meta['key'])
+                return None
+            if write is not None:
+                while True:
+                    try:
+                        chunk = f.read(chunk_size)
+                    except OSError as e:
+                        self._failed()
+                        self._discard(meta['key'])
+                        raise CacheReadError(f"Cached body of {meta['url']} became unreadable") from e
+                    if not chunk:
+                        break
+                    write(chunk)
+        with self._lock:
+            self.hits += 1
+            self.bytes_saved += meta['size']
+        return meta['size']
+
+    def writer(self, url: str, response, sink=None) -> Optional["CacheWriter"]:
+        """
+        Return a writer that tees the body into the cache, or None if the
+        response is not cacheable (no validators, or Cache-Control: no-store;
+        a stored entry for url is then evicted)
+
+        Args:
+            url: Requested URL
+            response: requests.Response with status 200
+            sink: Optional downstream sink that still receives every chunk
+        """
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if response.status_code != 200:
+            return None
+        if not (etag or last_modified) or 'no-store' in cache_control:
+            # A new, uncacheable body: whatever is stored for url is outdated
+            key = self._key(url)
+            if key in self._index:
+                self._discard(key)
+            return None
+        meta = {'key': self._key(url), 'url': url, 'etag': etag,
+                'last_modified': last_modified, 'size': 0}
+        try:
+            return CacheWriter(self, meta, sink)
+        except OSError:
+            self._failed()
+            return None
+
+    def _failed(self) -> None:
+        """Count a disk error; the response is served without the cache"""
+        with self._lock:
+            self.errors += 1
+
+    def _remove_files(self, key: str) -> None:
+        for suffix in (".json", ".body"):
+            try:
+                os.remove(self._path(key, suffix))
+            except OSError:
+                pass
+
+    def _discard(self, key: str) -> None:
+        """Forget an entry whose files may be inconsistent"""
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous['size']
+        self._remove_files(key)
+
+    def _store(self, meta: Dict[str, any]) -> None:
+        """Insert a committed entry and evict LRU entries beyond max_bytes"""
+        with self._lock:
+            previous = self._index.pop(meta['key'], None)
+            if previous is not None:
+                self._total_bytes -= previous['size']
+            self._index[meta['key']] = meta
+            self._total_bytes += meta['size']
+            victims = self._evict(keep=1)
+        for key in victims:
+            self._remove_files(key)
+
+    def _evict(self, keep: int) -> List[str]:
+        """Pop LRU entries beyond max_bytes (caller holds the lock); returns their keys"""
+        victims = []
+        while self._total_bytes > self.max_bytes and len(self._index) > keep:
+            _, victim = self._index.popitem(last=False)
+            self._total_bytes -= victim['size']
+            victims.append(victim['key'])
+        return victims
+
+    def stats(self) -> Dict[str, any]:
+        """Return hit/miss counters and current cache size"""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'bytes_saved': self.bytes_saved,
+                'errors': self.errors,
+                'entries': len(self._index),
+                'cached_bytes': self._total_bytes,
+            }
+
+
+class CacheWriter:
+    """
+    Sink that forwards chunks downstream while spooling them to a temp file
+
+    Nothing becomes visible to other threads until commit() atomically
+    renames the files into place. A disk error only drops the cache copy;
+    the downstream sink keeps receiving every chunk.
+    """
+
+    def __init__(self, cache: HTTPCache, meta: Dict[str, any], sink=None):
+        self.cache = cache
+        self.meta = meta
+        self._downstream = getattr(sink, 'write', sink)
+        self._tmp = os.path.join(cache.directory, f"tmp-{uuid.uuid4().hex}")
+        self._file = open(self._tmp, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        if self._file is not None:
+            try:
+                self._file.write(chunk)
+                self.meta['size'] += len(chunk)
+            except OSError:
+                self.cache._failed()
+                self.abort()
+        if self._downstream is not None:
+            self._downstream(chunk)
+
+    def commit(self) -> None:
+        """Publish the spooled body unless it is larger than the whole cache"""
+        if self._file is None:
+            return  # Aborted after a write error
+        if self.meta['size'] > self.cache.max_bytes:
+            self.abort()
+            return
+        key = self.meta['key']
+        meta_tmp = self._tmp + ".json"
+        try:
+            self._file.close()
+            with open(meta_tmp, "w") as f:
+                json.dump(self.meta, f)
+            os.replace(self._tmp, self.cache._path(key, ".body"))
+            os.replace(meta_tmp, self.cache._path(key, ".json"))
+        except OSError:
+            self.cache._failed()
+            self.abort()
+            try:
+                os.remove(meta_tmp)
+            except OSError:
+                pass
+            # Either file may already have been replaced: drop the entry
+            self.cache._discard(key)
+            return
+        self.cache._store(self.meta)
+
+    def abort(self) -> None:
+        """Drop the spooled body (e.g. the download failed or was too large)"""
+        if self._file is None:
+            return
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
+        try:
+            os.remove(self._tmp)
+        except OSError:
+            pass
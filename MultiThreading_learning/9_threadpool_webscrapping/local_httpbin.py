@@ -0,0 +1,209 @@
+import hashlib
+import json
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+"""
+Local httpbin Stand-in Example
+- In-process, threaded HTTP/1.1 server implementing the httpbin endpoints
+  the scrapers use: /delay/N, /status/N, /json, /html, /xml, /get, /uuid,
+  /headers, /ip, /user-agent, plus /bytes/N for payload-size experiments.
+- `latency` adds a fixed delay to every response and `error_rate` turns a
+  random share of responses into 500/503, so benchmarks are reproducible
+  without the internet.
+- Responses carry Content-Length and an ETag, so keep-alive pooling and the
+  conditional-request cache behave as they would against the real service.
+
+Usage:
+    with LocalHttpBin(latency=0.01) as server:
+        fetch_url(server.url("/json"))
+"""
+
+HTML_BODY = ("<!DOCTYPE html>\n<html>\n  <head></head>\n  <body>\n"
+             "      <h1>Herman Melville - Moby-Dick</h1>\n"
+             "      <div><p>Availing himself of the mild, summer-cool weather...</p></div>\n"
+             "  </body>\n</html>")
+
+XML_BODY = ("<?xml version='1.0' encoding='us-ascii'?>\n"
+            "<slideshow title=\"Sample Slide Show\" date=\"Date of publication\" author=\"Yours Truly\">\n"
+            "    <slide type=\"all\"><title>Wake up to WonderWidgets!</title></slide>\n"
+            "</slideshow>")
+
+JSON_BODY = {
+    "slideshow": {
+        "author": "Yours Truly",
+        "date": "date of publication",
+        "slides": [
+            {"title": "Wake up to WonderWidgets!", "type": "all"},
+            {"items": ["Why <em>WonderWidgets</em> are great", "Who <em>buys</em> WonderWidgets"],
+             "title": "Overview", "type": "all"},
+        ],
+        "title": "Sample Slide Show",
+    }
+}
+
+
+class HttpBinHandler(BaseHTTPRequestHandler):
+    """Request handler; server-wide settings live on self.server"""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real service
+    disable_nagle_algorithm = True  # Headers and body go out in separate writes
+
+    def log_message(self, format, *args):
+        pass  # Per-request logging would dominate benchmark timings
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        etag = '"' + hashlib.md5(body).hexdigest() + '"'
+        if status == 200 and self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if status == 200:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data, status: int = 200) -> None:
+        self._send(status, json.dumps(data, indent=2).encode())
+
+    def _request_info(self, query: dict) -> dict:
+        return {
+            "args": {k: v[0] if len(v) == 1 else v for k, v in query.items()},
+            "headers": dict(self.headers),
+            "origin": self.client_address[0],
+            "url": f"http://{self.headers.get('Host', '')}{self.path}",
+        }
+
+    def do_GET(self):
+        server = self.server
+        parts = urlsplit(self.path)
+        path = parts.path.rstrip("/") or "/"
+        query = parse_qs(parts.query)
+        segments = path.strip("/").split("/")
+
+        if server.latency:
+            time.sleep(server.latency)
+        if server.error_rate and random.random() < server.error_rate:
+            self._send(random.choice((500, 503)), b"", "text/plain")
+            return
+
+        try:
+            if segments[0] == "delay" and len(segments) == 2:
+                time.sleep(min(float(segments[1]), 10.0))
+                self._send_json(self._request_info(query))
+            elif segments[0] == "status" and len(segments) == 2:
+                self._send(int(segments[1]), b"", "text/plain")
+            elif segments[0] == "bytes" and len(segments) == 2:
+                size = min(int(segments[1]), 100 * 1024 * 1024)
+                self._send(200, server.payload(size), "application/octet-stream")
+            elif path == "/json":
+                self._send_json(JSON_BODY)
+            elif path == "/html":
+                self._send(200, HTML_BODY.encode(), "text/html; charset=utf-8")
+            elif path == "/xml":
+                self._send(200, XML_BODY.encode(), "application/xml")
+            elif path == "/get":
+                self._send_json(self._request_info(query))
+            elif path == "/uuid":
+                self._send_json({"uuid": str(uuid.uuid4())})
+            elif path == "/headers":
+                self._send_json({"headers": dict(self.headers)})
+            elif path == "/ip":
+                self._send_json({"origin": self.client_address[0]})
+            elif path == "/user-agent":
+                self._send_json({"user-agent": self.headers.get("User-Agent")})
+            else:
+                self._send(404, b"Not Found", "text/plain")
+        except ValueError:
+            self._send(400, b"Bad Request", "text/plain")
+
+
+class LocalHttpBin(ThreadingHTTPServer):
+    """
+    Threaded httpbin stand-in that runs on a background thread
+
+    Use as a context manager, or call start() / stop() explicitly.
+    """
+
+    daemon_threads = True
+    request_queue_size = 1024  # Room for benchmark-sized connection bursts
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, error_rate: float = 0.0):
+        """
+        Args:
+            host: Interface to bind
+            port: Port to bind (0 picks a free one)
+            latency: Extra seconds added to every response
+            error_rate: Share of responses (0-1) replaced by a 500/503
+        """
+        super().__init__((host, port), HttpBinHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self._payloads = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, path: str) -> str:
+        """Return the absolute URL for a path such as '/delay/1'"""
+        return self.base_url + path
+
+    def httpbin_url(self, url: str) -> str:
+        """Rewrite an https://httpbin.org/... URL to point at this server"""
+        parts = urlsplit(url)
+        return self.base_url + parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def payload(self, size: int) -> bytes:
+        """Deterministic payload of `size` bytes, generated once per size"""
+        body = self._payloads.get(size)
+        if body is None:
+            body = self._payloads[size] = (b"0123456789abcdef" * (size // 16 + 1))[:size]
+        return body
+
+    def start(self) -> "LocalHttpBin":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "LocalHttpBin":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Run a local httpbin stand-in")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    server = LocalHttpBin(port=args.port, latency=args.latency, error_rate=args.error_rate)
+    print(f"Serving httpbin stand-in on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
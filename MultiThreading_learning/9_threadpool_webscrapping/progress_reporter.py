@@ -0,0 +1,115 @@
+import json
+import sys
+import threading
+import time
+from collections import deque
+from typing import Dict, Mapping, Optional, TextIO
+
+"""
+Progress Reporter Example
+- Worker threads only append events to a collections.deque; append() is
+  atomic under the GIL, so the hot path takes no lock and does no I/O.
+- One background thread drains the deque and redraws the progress line
+  at a fixed refresh rate with req/s, bytes/s, error rate and ETA.
+- When the output is not a terminal (a log file, CI), it prints one
+  structured JSON line every log_interval seconds instead of redrawing.
+"""
+
+
+class ProgressReporter:
+    """
+    Low-contention progress and metrics reporter for long scrapes
+
+    Usage:
+        with ProgressReporter(total=len(urls)) as reporter:
+            for result in scrape_urls_streaming(urls):
+                reporter.record(result)
+    """
+
+    def __init__(self, total: Optional[int] = None, refresh_interval: float = 0.5,
+                 log_interval: float = 10.0, stream: Optional[TextIO] = None):
+        """
+        Args:
+            total: Expected number of results (enables % and ETA)
+            refresh_interval: Seconds between redraws on a terminal
+            log_interval: Seconds between structured lines on a non-terminal
+            stream: Output stream (defaults to sys.stderr)
+        """
+        self.total = total
+        self.stream = stream if stream is not None else sys.stderr
+        self.is_tty = hasattr(self.stream, "isatty") and self.stream.isatty()
+        self.interval = refresh_interval if self.is_tty else log_interval
+        self._events = deque()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.completed = 0
+        self.errors = 0
+        self.bytes = 0
+        self.start_time = time.monotonic()
+
+    def record(self, result: Mapping) -> None:
+        """Queue one finished result; safe to call from any thread"""
+        self._events.append((result['success'], result['content_length']))
+
+    def _drain(self) -> None:
+        events = self._events
+        while events:
+            success, content_length = events.popleft()
+            self.completed += 1
+            self.bytes += content_length
+            if not success:
+                self.errors += 1
+
+    def snapshot(self) -> Dict[str, any]:
+        """Current metrics (drains pending events first)"""
+        self._drain()
+        elapsed = max(time.monotonic() - self.start_time, 1e-9)
+        rate = self.completed / elapsed
+        remaining = (self.total - self.completed) if self.total is not None else None
+        return {
+            'completed': self.completed,
+            'total': self.total,
+            'elapsed': elapsed,
+            'requests_per_sec': rate,
+            'bytes_per_sec': self.bytes / elapsed,
+            'error_rate': self.errors / self.completed if self.completed else 0.0,
+            'eta': remaining / rate if remaining is not None and rate > 0 else None,
+        }
+
+    def render(self, final: bool = False) -> None:
+        stats = self.snapshot()
+        if not self.is_tty:
+            print(json.dumps({'event': 'progress', **stats}), file=self.stream, flush=True)
+            return
+        done = f"{stats['completed']}"
+        if self.total:
+            done += f"/{self.total} ({stats['completed'] / self.total:.1%})"
+        eta = f"{stats['eta']:.0f}s" if stats['eta'] is not None else "--"
+        line = (f"\r{done} | {stats['requests_per_sec']:.1f} req/s | "
+                f"{stats['bytes_per_sec'] / 1024:.1f} KiB/s | "
+                f"errors {stats['error_rate']:.1%} | ETA {eta}")
+        self.stream.write(line.ljust(80) + ("\n" if final else ""))
+        self.stream.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.render()
+
+    def start(self) -> "ProgressReporter":
+        self.start_time = time.monotonic()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the render thread and draw the final state"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.render(final=True)
+
+    def __enter__(self) -> "ProgressReporter":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
@@ -0,0 +1,183 @@
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+"""
+Token Bucket Rate Limiter Example
+- Each host gets a bucket that refills at `rate` tokens per second and holds
+  at most `burst` tokens.
+- acquire() reserves a token under a short lock and then sleeps *outside* the
+  lock, so many threads can wait at the same time without serializing.
+- report() compares the sustained throughput (tokens beyond the initial
+  burst, over the bucket's lifetime) with the configured rate.
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket that hands out reservations instead of blocking under a lock
+
+    The token count is allowed to go negative: a negative balance means the
+    caller has reserved a future token and must sleep until it is due.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None):
+        """
+        Args:
+            rate: Tokens added per second
+            burst: Maximum number of tokens stored (defaults to max(1, rate))
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate)
+        self._tokens = self.burst
+        self._updated = self.created = time.monotonic()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.last_acquire: Optional[float] = None
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """
+        Reserve tokens and return how long the caller must wait for them
+
+        Constant time: only a refill calculation and a subtraction are done
+        under the lock.
+
+        Args:
+            tokens: Number of tokens to take
+
+        Returns:
+            Seconds to wait before the reservation is valid (0 if available now)
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.acquired += 1
+            self.total_wait += wait
+            self.last_acquire = now + wait
+            return wait
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Take tokens, sleeping outside the lock if the bucket is empty
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    def measured_rate(self) -> float:
+        """
+        Sustained acquisitions per second since the bucket was created
+
+        The initial burst is handed out without waiting, so it says nothing
+        about the rate: only acquisitions beyond it are counted. Returns 0.0
+        while every acquisition still fit in the burst.
+        """
+        if self.acquired <= self.burst or self.last_acquire <= self.created:
+            return 0.0
+        return (self.acquired - self.burst) / (self.last_acquire - self.created)
+
+
+class HostRateLimiter:
+    """
+    Per-host collection of token buckets
+
+    Buckets are created lazily; the lock is only taken the first time a host
+    is seen, so the steady-state acquire path is a dict lookup plus the
+    bucket's own short critical section.
+    """
+
+    def __init__(self, requests_per_second: float, burst: Optional[float] = None,
+                 per_host: bool = True):
+        """
+        Args:
+            requests_per_second: Allowed request rate (per host if per_host)
+            burst: Bucket capacity, i.e. requests allowed back to back
+            per_host: Keep a bucket per host instead of one global bucket
+        """
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.per_host = per_host
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket_for(self, url: str) -> TokenBucket:
+        key = (urlsplit(url).hostname or "") if self.per_host else "*"
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    bucket = TokenBucket(self.requests_per_second, self.burst)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def acquire(self, url: str) -> float:
+        """
+        Wait until a request to url's host is allowed
+
+        Args:
+            url: URL about to be fetched
+
+        Returns:
+            Seconds spent waiting
+        """
+        return self._bucket_for(url).acquire()
+
+    def wrap(self, func):
+        """
+        Wrap a fetch function (e.g. fetch_url) so every call is rate limited
+
+        Args:
+            func: Callable taking the URL as its first argument
+
+        Returns:
+            Rate-limited callable with the same signature
+        """
+        def rate_limited(url: str, *args, **kwargs):
+            self.acquire(url)
+            return func(url, *args, **kwargs)
+        return rate_limited
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        Compare measured throughput with the configured rate for every bucket
+
+        Returns:
+            Mapping of host -> configured rate, measured rate, deviation from
+            the configured rate (%, negative when below it; None while within
+            the burst) and average wait per request
+        """
+        report = {}
+        for host, bucket in list(self._buckets.items()):
+            measured = bucket.measured_rate()
+            report[host] = {
+                'configured_rps': bucket.rate,
+                'measured_rps': measured,
+                'deviation_pct': (measured / bucket.rate - 1) * 100 if measured else None,
+                'requests': bucket.acquired,
+                'avg_wait': bucket.total_wait / bucket.acquired if bucket.acquired else 0.0,
+            }
+        return report
+
+    def print_report(self) -> None:
+        """Print report() in the same style as process_results"""
+        print(f"\n=== RATE LIMITER ===")
+        for host, stats in self.report().items():
+            deviation = stats['deviation_pct']
+            if deviation is None:
+                target = "within burst"
+            else:
+                target = f"{abs(deviation):.1f}% {'above' if deviation > 0 else 'below'} target"
+            print(f"  {host}: {stats['measured_rps']:.2f}/{stats['configured_rps']:.2f} req/s "
+                  f"({target}, {stats['requests']} requests, avg wait {stats['avg_wait']:.2f}s)")
@@ -0,0 +1,206 @@
+import socket
+import threading
+import time
+from typing import Dict, Iterable, Optional
+
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import NameResolutionError
+from urllib3.util.connection import allowed_gai_family
+
+from dns_cache import default_dns_cache
+from result_stats import LatencyHistogram
+
+"""
+Per-Phase Request Timing Example
+- urllib3 connection subclasses record DNS, TCP connect, TLS handshake and
+  time-to-first-byte with time.perf_counter() (monotonic).
+- fetch_url(..., record_timings=True) adds the body transfer time and
+  attaches the RequestTimings to its result. It is opt-in: the timing is
+  cheap (a handful of perf_counter() calls), but one more object per result
+  undoes the compact ScrapeResult records on very large runs.
+- The timer travels through a threading.local, since every request runs to
+  completion on one worker thread.
+"""
+
+PHASES = ('dns', 'connect', 'tls', 'ttfb', 'transfer', 'total')
+
+_current = threading.local()
+
+
+class RequestTimings:
+    """
+    Monotonic per-phase durations (seconds) for a single request
+
+    dns/connect/tls stay at 0.0 when a pooled keep-alive connection was reused.
+    Redirects add up, so every phase covers the whole fetch.
+    """
+
+    __slots__ = PHASES + ('reused',)
+
+    def __init__(self):
+        self.dns = 0.0
+        self.connect = 0.0
+        self.tls = 0.0
+        self.ttfb = 0.0
+        self.transfer = 0.0
+        self.total = 0.0
+        self.reused = True
+
+    def to_dict(self) -> Dict[str, float]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        phases = ", ".join(f"{name}={getattr(self, name) * 1000:.1f}ms" for name in PHASES)
+        return f"RequestTimings({phases}, reused={self.reused})"
+
+
+def start_timing() -> RequestTimings:
+    """Begin recording phases for the request about to run on this thread"""
+    timings = RequestTimings()
+    _current.timings = timings
+    return timings
+
+
+def stop_timing() -> None:
+    """Stop recording on this thread"""
+    _current.timings = None
+
+
+def current_timing() -> Optional[RequestTimings]:
+    return getattr(_current, 'timings', None)
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """
+    HTTPConnection that resolves through the shared DNS cache and records
+    DNS, connect and TTFB phases
+    """
+
+    def _new_conn(self) -> socket.socket:
+        timings = current_timing()
+        if timings is not None:
+            timings.reused = False
+
+        # Resolve up front (through the shared DNS cache) so DNS and TCP
+        # connect are timed separately
+        start = time.perf_counter()
+        try:
+            addresses = default_dns_cache.getaddrinfo(self._dns_host, self.port,
+                                                      allowed_gai_family(), socket.SOCK_STREAM)
+        except socket.gaierror as e:
+            # Same error urllib3 raises; a cached failure is not looked up again
+            raise NameResolutionError(self.host, self, e) from e
+        finally:
+            resolved = time.perf_counter()
+            if timings is not None:
+                timings.dns += resolved - start
+
+        hostname = self._dns_host
+        if addresses:
+            # Connect to the resolved address; urllib3 skips DNS for literal IPs
+            self._dns_host = addresses[0][4][0]
+        try:
+            return super()._new_conn()
+        except OSError:
+            if self._dns_host == hostname:
+                raise
+            # Let urllib3 try every address, as it would have without us
+            self._dns_host = hostname
+            return super()._new_conn()
+        finally:
+            self._dns_host = hostname
+            if timings is not None:
+                timings.connect += time.perf_counter() - resolved
+
+    def getresponse(self, *args, **kwargs):
+        timings = current_timing()
+        if timings is None:
+            return super().getresponse(*args, **kwargs)
+        start = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        timings.ttfb += time.perf_counter() - start
+        return response
+
+
+class TimedHTTPSConnection(TimedHTTPConnection, HTTPSConnection):
+    """HTTPSConnection that additionally records the TLS handshake"""
+
+    def connect(self) -> None:
+        timings = current_timing()
+        if timings is None:
+            return super().connect()
+        before = timings.dns + timings.connect
+        start = time.perf_counter()
+        super().connect()
+        # connect() = DNS + TCP connect (_new_conn) + TLS handshake
+        timings.tls += (time.perf_counter() - start) - (timings.dns + timings.connect - before)
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools use the timed connection classes"""
+
+    def init_poolmanager(self, *args, **kwargs) -> None:
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': TimedHTTPConnectionPool,
+            'https': TimedHTTPSConnectionPool,
+        }
+
+
+class TimingAggregator:
+    """
+    Per-phase histograms built from RequestTimings, mergeable like
+    ResultAggregator
+    """
+
+    def __init__(self):
+        self.phases = {name: LatencyHistogram() for name in PHASES}
+        self.sums = {name: 0.0 for name in PHASES}
+        self.count = 0
+        self.new_connections = 0
+
+    def add(self, timings: RequestTimings) -> None:
+        self.count += 1
+        if not timings.reused:
+            self.new_connections += 1
+        for name in PHASES:
+            value = getattr(timings, name)
+            self.sums[name] += value
+            self.phases[name].add(value)
+
+    def add_all(self, results: Iterable) -> "TimingAggregator":
+        """Add the 'timings' field of every result that carries one"""
+        for result in results:
+            timings = result.get('timings')
+            if timings is not None:
+                self.add(timings)
+        return self
+
+    def merge(self, other: "TimingAggregator") -> "TimingAggregator":
+        self.count += other.count
+        self.new_connections += other.new_connections
+        for name in PHASES:
+            self.sums[name] += other.sums[name]
+            self.phases[name].merge(other.phases[name])
+        return self
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Return mean, p50 and p95 in seconds for every phase"""
+        return {
+            name: {
+                'mean': self.sums[name] / self.count if self.count else 0.0,
+                'p50': self.phases[name].percentile(50),
+                'p95': self.phases[name].percentile(95),
+            }
+            for name in PHASES
+        }
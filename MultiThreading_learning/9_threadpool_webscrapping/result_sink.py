@@ -0,0 +1,209 @@
+import gzip
+import json
+import queue
+import threading
+import time
+from typing import Dict, List, Mapping, Optional
+
+"""
+Result Sink Example
+- Stream scrape results to disk instead of holding them all in a list.
+- write() puts the record on a bounded queue; a background thread collects
+  batches (by size or by time) and writes them as JSONL (optionally
+  gzip-compressed) or as Parquet row groups (needs pyarrow).
+- When the disk falls behind the queue fills up and write() blocks, which
+  pauses the consuming loop and, through scrape_urls_streaming's bounded
+  window, the scraper itself.
+"""
+
+_STOP = object()
+
+
+def result_record(result: Mapping) -> Dict[str, any]:
+    """Flatten a result (ScrapeResult or dict) into JSON/Arrow friendly values"""
+    record = {}
+    for key, value in result.items():
+        if hasattr(value, 'to_dict'):
+            value = value.to_dict()  # e.g. RequestTimings
+        record[key] = value
+    return record
+
+
+class ResultSink:
+    """
+    Base class: bounded queue plus a batching background writer thread
+
+    Subclasses implement _open(), _write_batch(records) and _close().
+    """
+
+    def __init__(self, batch_size: int = 1000, flush_interval: float = 1.0,
+                 max_pending_batches: int = 4):
+        """
+        Args:
+            batch_size: Records per write
+            flush_interval: Maximum seconds a record waits before it is written
+            max_pending_batches: Queue capacity in batches; write() blocks
+                                 beyond it (backpressure)
+        """
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: "queue.Queue" = queue.Queue(maxsize=batch_size * max_pending_batches)
+        self._thread: Optional[threading.Thread] = None
+        self._error: Optional[BaseException] = None
+        self.records_written = 0
+        self.batches_written = 0
+        self.blocked_time = 0.0
+
+    def write(self, result: Mapping) -> None:
+        """
+        Queue one result for writing; blocks while the writer is behind
+
+        Raises:
+            RuntimeError: If the writer thread has failed
+        """
+        if self._error is not None:
+            raise RuntimeError("Result sink writer failed") from self._error
+        record = result_record(result)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            start = time.monotonic()
+            self._queue.put(record)
+            self.blocked_time += time.monotonic() - start
+
+    def _run(self) -> None:
+        stopping = False
+        try:
+            self._open()
+            while not stopping:
+                batch: List[Dict[str, any]] = []
+                flush_at = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get(timeout=max(0.0, flush_at - time.monotonic()))
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                if batch:
+                    self._write_batch(batch)
+                    self.records_written += len(batch)
+                    self.batches_written += 1
+        except BaseException as e:
+            self._error = e
+            # Keep draining so producers blocked on put() are released, unless
+            # the stop marker was already consumed (the final batch failed)
+            while not stopping:
+                if self._queue.get() is _STOP:
+                    break
+        finally:
+            self._close()
+
+    def start(self) -> "ResultSink":
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Write everything still queued and stop the writer"""
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+            self._thread = None
+        if self._error is not None:
+            raise RuntimeError("Result sink writer failed") from self._error
+
+    def __enter__(self) -> "ResultSink":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _open(self) -> None:
+        pass
+
+    def _write_batch(self, records: List[Dict[str, any]]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        pass
+
+
+class JSONLSink(ResultSink):
+    """One JSON object per line; compress='gzip' writes a .jsonl.gz"""
+
+    def __init__(self, path: str, compress: Optional[str] = None, **kwargs):
+        """
+        Args:
+            path: Output file
+            compress: None or 'gzip'
+            **kwargs: batch_size, flush_interval, max_pending_batches
+        """
+        if compress not in (None, 'gzip'):
+            raise ValueError(f"Unsupported compression: {compress}")
+        super().__init__(**kwargs)
+        self.path = path
+        self.compress = compress
+        self._file = None
+
+    def _open(self) -> None:
+        if self.compress == 'gzip':
+            self._file = gzip.open(self.path, "at", encoding="utf-8")
+        else:
+            self._file = open(self.path, "a", encoding="utf-8")
+
+    def _write_batch(self, records: List[Dict[str, any]]) -> None:
+        # One write call per batch instead of one per record
+        self._file.write("".join(json.dumps(record) + "\n" for record in records))
+        self._file.flush()
+
+    def _close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+
+
+class ParquetSink(ResultSink):
+    """Columnar output; every batch becomes a Parquet row group (needs pyarrow)"""
+
+    COLUMNS = ('url', 'status', 'content_length', 'response_time', 'success', 'error',
+               'error_kind', 'cache_hit')
+
+    def __init__(self, path: str, **kwargs):
+        """
+        Args:
+            path: Output .parquet file
+            **kwargs: batch_size, flush_interval, max_pending_batches
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError as e:
+            raise ImportError("ParquetSink requires pyarrow (pip install pyarrow)") from e
+        super().__init__(**kwargs)
+        self.path = path
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._schema = pyarrow.schema([
+            ('url', pyarrow.string()),
+            ('status', pyarrow.int32()),
+            ('content_length', pyarrow.int64()),
+            ('response_time', pyarrow.float64()),
+            ('success', pyarrow.bool_()),
+            ('error', pyarrow.string()),
+            ('error_kind', pyarrow.string()),
+            ('cache_hit', pyarrow.bool_()),
+        ])
+        self._writer = None
+
+    def _open(self) -> None:
+        self._writer = self._pq.ParquetWriter(self.path, self._schema)
+
+    def _write_batch(self, records: List[Dict[str, any]]) -> None:
+        columns = {name: [record.get(name) for record in records] for name in self.COLUMNS}
+        self._writer.write_table(self._pa.table(columns, schema=self._schema))
+
+    def _close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
@@ -0,0 +1,217 @@
+import math
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+"""
+Compact Results and Online Statistics Example
+- ScrapeResult stores one fetch in __slots__ instead of a per-URL dict, but
+  still reads like the old dict (result['success'], result.get(...)).
+- LatencyHistogram keeps log-spaced bucket counts, so p50/p95/p99 can be
+  computed from a few hundred integers instead of every latency.
+- ResultAggregator folds results in one pass without keeping them; one
+  aggregator per worker can be merged at the end without any locking.
+"""
+
+_MISSING = object()
+
+
+class ScrapeResult(Mapping):
+    """
+    Read-only, slot-based record with the same keys as the fetch_url dict
+
+    Optional fields that were never set are absent from the mapping, so
+    `'cache_hit' in result` behaves exactly as it did for dicts.
+    """
+
+    __slots__ = ('url', 'status', 'content_length', 'response_time', 'success',
+                 'error', 'error_kind', 'attempts', 'cache_hit', 'timings')
+
+    _FIELDS = ('url', 'status', 'content_length', 'response_time', 'success', 'error')
+    _OPTIONAL = ('error_kind', 'attempts', 'cache_hit', 'timings')
+
+    def __init__(self, url: str, status: Optional[int], content_length: int,
+                 response_time: float, success: bool, error: Optional[str] = None,
+                 **optional):
+        self.url = url
+        self.status = status
+        self.content_length = content_length
+        self.response_time = response_time
+        self.success = success
+        self.error = error
+        for name in self._OPTIONAL:
+            setattr(self, name, optional.pop(name, _MISSING))
+        if optional:
+            raise TypeError(f"Unknown result fields: {', '.join(optional)}")
+
+    def __getitem__(self, key: str):
+        if key in self.__slots__:
+            value = getattr(self, key)
+            if value is not _MISSING:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for name in self.__slots__:
+            if getattr(self, name) is not _MISSING:
+                yield name
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"ScrapeResult({dict(self)!r})"
+
+    def to_dict(self) -> Dict[str, any]:
+        return dict(self)
+
+    # Pickle only the present fields: the _MISSING sentinel would not survive
+    # the trip to another process (e.g. results from a multiprocessing.Pool)
+    def __getstate__(self) -> Dict[str, any]:
+        return dict(self)
+
+    def __setstate__(self, state: Dict[str, any]) -> None:
+        for name in self.__slots__:
+            setattr(self, name, state.get(name, _MISSING))
+
+
+class LatencyHistogram:
+    """
+    Mergeable histogram with log-spaced buckets
+
+    Bucket i covers [min_value * growth**i, min_value * growth**(i+1)), so any
+    percentile is reported within a relative error of (growth - 1).
+    """
+
+    def __init__(self, growth: float = 1.02, min_value: float = 1e-4):
+        """
+        Args:
+            growth: Ratio between neighbouring bucket bounds (1.02 -> ~2% error)
+            min_value: Smallest latency in seconds that gets its own bucket
+        """
+        self.growth = growth
+        self.min_value = min_value
+        self._log_growth = math.log(growth)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        """Record one latency in seconds"""
+        index = 0 if value <= self.min_value else int(math.log(value / self.min_value) / self._log_growth)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: "LatencyHistogram") -> "LatencyHistogram":
+        """Add another histogram's counts into this one (bucket layouts must match)"""
+        if (other.growth, other.min_value) != (self.growth, self.min_value):
+            raise ValueError("Cannot merge histograms with different bucket layouts")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.max = max(self.max, other.max)
+        return self
+
+    def percentile(self, p: float) -> float:
+        """
+        Args:
+            p: Percentile between 0 and 100
+
+        Returns:
+            Estimated latency at that percentile (midpoint of its bucket)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * p / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                lower = self.min_value * self.growth ** index
+                return min(self.max, lower * (1 + self.growth) / 2)
+        return self.max
+
+
+class ResultAggregator:
+    """
+    Incremental summary of scrape results that never stores per-URL records
+
+    Not thread-safe by design: give every worker its own aggregator and
+    merge() them, which avoids a shared lock on the hot path.
+    """
+
+    def __init__(self, max_errors: int = 20):
+        """
+        Args:
+            max_errors: Number of failed URLs to keep for the final report
+        """
+        self.total = 0
+        self.successful = 0
+        self.failed = 0
+        self.total_bytes = 0
+        self.total_response_time = 0.0
+        self.cache_tracked = 0
+        self.cache_hits = 0
+        self.bytes_saved = 0
+        self.latency = LatencyHistogram()
+        self.max_errors = max_errors
+        self.errors: List[Tuple[str, str]] = []
+
+    def add(self, result: Mapping) -> None:
+        """Fold one result (ScrapeResult or dict) into the summary"""
+        self.total += 1
+        if result['success']:
+            self.successful += 1
+            self.total_bytes += result['content_length']
+            self.total_response_time += result['response_time']
+            self.latency.add(result['response_time'])
+            cache_hit = result.get('cache_hit')
+            if cache_hit is not None:
+                self.cache_tracked += 1
+                if cache_hit:
+                    self.cache_hits += 1
+                    self.bytes_saved += result['content_length']
+        else:
+            self.failed += 1
+            if len(self.errors) < self.max_errors:
+                self.errors.append((result['url'], result['error']))
+
+    def add_all(self, results: Iterable[Mapping]) -> "ResultAggregator":
+        for result in results:
+            self.add(result)
+        return self
+
+    def merge(self, other: "ResultAggregator") -> "ResultAggregator":
+        """Combine another aggregator (e.g. from another worker) into this one"""
+        self.total += other.total
+        self.successful += other.successful
+        self.failed += other.failed
+        self.total_bytes += other.total_bytes
+        self.total_response_time += other.total_response_time
+        self.cache_tracked += other.cache_tracked
+        self.cache_hits += other.cache_hits
+        self.bytes_saved += other.bytes_saved
+        self.latency.merge(other.latency)
+        room = self.max_errors - len(self.errors)
+        self.errors.extend(other.errors[:max(0, room)])
+        return self
+
+    @property
+    def avg_response_time(self) -> float:
+        return self.total_response_time / self.successful if self.successful else 0.0
+
+    def summary(self) -> Dict[str, any]:
+        """Return the aggregated numbers as a plain dict"""
+        return {
+            'total': self.total,
+            'successful': self.successful,
+            'failed': self.failed,
+            'total_bytes': self.total_bytes,
+            'avg_response_time': self.avg_response_time,
+            'p50': self.latency.percentile(50),
+            'p95': self.latency.percentile(95),
+            'p99': self.latency.percentile(99),
+            'cache_hits': self.cache_hits,
+            'bytes_saved': self.bytes_saved,
+        }
@@ -0,0 +1,151 @@
+import random
+import threading
+import time
+from typing import Callable, Dict, Mapping, Optional
+
+"""
+Retry Policy Example
+- Classify each outcome: success, retryable (timeouts, connection errors,
+  429 and 5xx) or fatal (other 4xx, oversized bodies, ...).
+- Back off with "decorrelated jitter": every delay is drawn at random
+  between base_delay and 3x the previous delay, so failing workers spread
+  out instead of retrying in lockstep.
+- A process-wide RetryBudget caps retries at a share of all requests
+  (10% by default), so during an outage retries cannot multiply the load.
+"""
+
+RETRYABLE_STATUSES = {408, 429, 500, 502, 503, 504}
+RETRYABLE_KINDS = {'timeout', 'connection'}
+
+SUCCESS, RETRYABLE, FATAL = 'success', 'retryable', 'fatal'
+
+
+def classify(result: Mapping) -> str:
+    """
+    Args:
+        result: Result from fetch_url
+
+    Returns:
+        'success', 'retryable' or 'fatal'
+    """
+    if result['success']:
+        return SUCCESS
+    if result.get('error_kind') in RETRYABLE_KINDS or result.get('status') in RETRYABLE_STATUSES:
+        return RETRYABLE
+    return FATAL
+
+
+class RetryBudget:
+    """
+    Token bucket of retries shared by every worker in the process
+
+    Each first attempt deposits `ratio` tokens and each retry withdraws one,
+    so in steady state retries are at most `ratio` of the requests. A small
+    `min_tokens` reserve lets low-volume jobs retry at all.
+    """
+
+    def __init__(self, ratio: float = 0.1, min_tokens: float = 10.0, max_tokens: float = 100.0):
+        """
+        Args:
+            ratio: Retries allowed per request (0.1 -> 10%)
+            min_tokens: Retries available before any request was made
+            max_tokens: Cap on saved-up retries, so a long calm period does
+                        not buy an unlimited burst later
+        """
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = min_tokens
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+
+    def record_request(self) -> None:
+        with self._lock:
+            self.requests += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take one retry token; False means the budget is exhausted"""
+        with self._lock:
+            if self._tokens < 1:
+                self.denied += 1
+                return False
+            self._tokens -= 1
+            self.retries += 1
+            return True
+
+    def stats(self) -> Dict[str, any]:
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'retries': self.retries,
+                'denied': self.denied,
+                'retry_ratio': self.retries / self.requests if self.requests else 0.0,
+            }
+
+
+# Shared by every RetryPolicy that is not given its own budget
+default_retry_budget = RetryBudget()
+
+
+class RetryPolicy:
+    """
+    Retry loop with outcome classification, decorrelated jitter and a budget
+
+    Usable directly (policy.call(fetch_url, url)) or as a wrapper for the
+    thread-pool scrapers (executor.map(policy.wrap(fetch_url), urls)).
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 0.1, max_delay: float = 10.0,
+                 budget: Optional[RetryBudget] = None,
+                 classifier: Callable[[Mapping], str] = classify):
+        """
+        Args:
+            max_retries: Maximum number of retries after the first attempt
+            base_delay: Smallest backoff delay in seconds
+            max_delay: Largest backoff delay in seconds
+            budget: RetryBudget to draw from (defaults to the process-wide one)
+            classifier: Function mapping a result to success/retryable/fatal
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget if budget is not None else default_retry_budget
+        self.classifier = classifier
+
+    def next_delay(self, previous: float) -> float:
+        """Decorrelated jitter: uniform in [base, 3 * previous], capped"""
+        return min(self.max_delay, random.uniform(self.base_delay, max(self.base_delay, previous * 3)))
+
+    def call(self, func: Callable, url: str, *args, **kwargs):
+        """
+        Call func(url, *args, **kwargs) and retry retryable outcomes
+
+        Returns:
+            The last result, with result['attempts'] set to the number of tries
+        """
+        self.budget.record_request()
+        delay = self.base_delay
+        attempt = 1
+        while True:
+            result = func(url, *args, **kwargs)
+            outcome = self.classifier(result)
+            if (outcome != RETRYABLE or attempt > self.max_retries
+                    or not self.budget.try_spend()):
+                break
+            delay = self.next_delay(delay)
+            print(f"Retry {attempt} for {url} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+        if isinstance(result, dict):
+            result['attempts'] = attempt
+        else:
+            result.attempts = attempt  # ScrapeResult
+        return result
+
+    def wrap(self, func: Callable) -> Callable:
+        """Return func with this retry policy applied"""
+        def with_retries(url: str, *args, **kwargs):
+            return self.call(func, url, *args, **kwargs)
+        return with_retries
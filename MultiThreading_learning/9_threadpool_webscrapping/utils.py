@@ -1,7 +1,28 @@
 import requests
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+import itertools
+import math
 import time
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Iterator, Callable
+
+from connection_pool import default_pool
+from rate_limiter import HostRateLimiter
+from http_cache import HTTPCache, CacheReadError
+from result_stats import ScrapeResult, ResultAggregator
+from concurrency_control import AIMDController
+from checkpoint import CheckpointStore
+from deadline import Deadline
+from hedging import HedgePolicy
+from result_sink import ResultSink
+from retry_policy import RetryPolicy
+from request_timing import RequestTimings, TimingAggregator, start_timing, stop_timing
+
+# Not used here: re-exported for the scripts' `from utils import *`
+from concurrent.futures import as_completed
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from progress_reporter import ProgressReporter
+from result_sink import JSONLSink
 
 
 urls = [
@@ -17,106 +38,680 @@ urls = [
         "https://httpbin.org/ip"
     ]
 
-def fetch_url(url: str, timeout: int = 10) -> Dict[str, any]:
+# Conditional-request cache used by fetch_url; None until enable_http_cache()
+http_cache: Optional[HTTPCache] = None
+
+
+class BodyTooLargeError(requests.exceptions.RequestException):
+    """Raised when a response body exceeds the configured max_body_size"""
+
+
+class CacheReplayError(requests.exceptions.RequestException):
+    """Raised when a cached body breaks off mid-replay (the sink holds part of it)"""
+
+
+def read_body(response: requests.Response, max_body_size: Optional[int] = None,
+              sink=None, chunk_size: int = 64 * 1024) -> int:
+    """
+    Stream a response body in chunks, counting bytes as they arrive
+    
+    Args:
+        response: Response opened with stream=True
+        max_body_size: Abort once more than this many bytes have been read
+        sink: Optional file-like object (with write()) or callable that
+              receives each chunk; without a sink chunks are discarded
+        chunk_size: Bytes read per iteration
+    
+    Returns:
+        Number of body bytes read
+    """
+    # Fail fast when the server announces a body that is already too big
+    declared = response.headers.get('Content-Length')
+    if max_body_size is not None and declared and declared.isdigit() and int(declared) > max_body_size:
+        raise BodyTooLargeError(f"Body of {declared} bytes exceeds limit of {max_body_size} bytes",
+                                response=response)
+    
+    write = getattr(sink, 'write', sink)
+    total = 0
+    for chunk in response.iter_content(chunk_size=chunk_size):
+        total += len(chunk)
+        if max_body_size is not None and total > max_body_size:
+            raise BodyTooLargeError(f"Body exceeded limit of {max_body_size} bytes",
+                                    response=response)
+        if write is not None:
+            write(chunk)
+    return total
+
+
+def error_kind(error: Exception) -> str:
+    """
+    Classify a requests exception into a coarse kind
+    
+    Returns:
+        'timeout', 'connection', 'http', 'too_large' or 'other'
+    """
+    if isinstance(error, requests.exceptions.Timeout):
+        return 'timeout'
+    if isinstance(error, requests.exceptions.ConnectionError):
+        return 'connection'
+    if isinstance(error, requests.exceptions.HTTPError):
+        return 'http'
+    if isinstance(error, BodyTooLargeError):
+        return 'too_large'
+    return 'other'
+
+
+def enable_http_cache(directory: str = ".http_cache",
+                      max_bytes: int = 100 * 1024 * 1024) -> HTTPCache:
+    """
+    Turn on the conditional-request cache used by fetch_url
+    
+    Args:
+        directory: Directory holding the cached bodies
+        max_bytes: Maximum total size of cached bodies
+    
+    Returns:
+        The HTTPCache instance now used by fetch_url
+    """
+    global http_cache
+    http_cache = HTTPCache(directory, max_bytes)
+    return http_cache
+
+
+def _download(url: str, timeout: int, max_body_size: Optional[int], sink,
+              cache: Optional[HTTPCache], timings: Optional[RequestTimings] = None) -> tuple:
+    """
+    Perform the GET, revalidating against the cache when an entry exists
+    
+    Cache disk errors are absorbed by the cache; the body is then served
+    from the network without being cached.
+    
+    Returns:
+        (status code, body bytes, whether the body came from the cache)
+    """
+    entry = cache.lookup(url) if cache is not None else None
+    headers = HTTPCache.conditional_headers(entry) if entry else None
+    
+    # Reuse a pooled keep-alive connection instead of a fresh TCP/TLS handshake
+    with default_pool.get(url, timeout=timeout, stream=True, headers=headers) as response:
+        if entry is not None and response.status_code == 304:
+            if max_body_size is not None and entry['size'] > max_body_size:
+                raise BodyTooLargeError(f"Body exceeded limit of {max_body_size} bytes",
+                                        response=response)
+            try:
+                content_length = cache.replay(entry, sink)
+            except CacheReadError as e:
+                # Part of the body already reached the sink: a refetch
+                # would write it twice, so fail this URL instead
+                raise CacheReplayError(str(e), response=response) from e
+            if content_length is not None:
+                # Only 200 responses are cached: report the status the body
+                # was served with; cache_hit tells that it was revalidated
+                return 200, content_length, True
+        else:
+            response.raise_for_status()  # Raise exception for bad status codes
+            writer = cache.writer(url, response, sink) if cache is not None else None
+            transfer_start = time.perf_counter()
+            try:
+                content_length = read_body(response, max_body_size, writer or sink)
+            except BaseException:
+                if writer is not None:
+                    writer.abort()
+                raise
+            finally:
+                if timings is not None:
+                    timings.transfer += time.perf_counter() - transfer_start
+            if writer is not None:
+                writer.commit()
+            return response.status_code, content_length, False
+    
+    # The cached body was evicted between lookup and replay: fetch it again
+    return _download(url, timeout, max_body_size, sink, None, timings)
+
+
+def fetch_url(url: str, timeout: int = 10, max_body_size: Optional[int] = None,
+              sink=None, cache: Optional[HTTPCache] = None,
+              record_timings: bool = False, quiet: bool = False) -> ScrapeResult:
     """
     Fetch a single URL and return result information
     
+    The body is streamed in chunks and only counted (or handed to sink), so
+    large responses are never held in memory in full. When a cache is given
+    (or enabled with enable_http_cache) the request is made conditional and
+    a 304 answer is served from the cached body.
+    
     Args:
         url: URL to fetch
         timeout: Request timeout in seconds
+        max_body_size: Maximum body size in bytes; larger responses fail early
+        sink: Optional file-like object or callable receiving body chunks
+        cache: HTTPCache to use instead of the module-level http_cache
+        record_timings: Attach per-phase RequestTimings as result['timings']
+                        (off by default: one extra object per result)
+        quiet: Skip the per-request prints (e.g. under a ProgressReporter)
     
     Returns:
-        Dictionary containing URL, status, content length, and response time
+        ScrapeResult (read like a dict) containing URL, status, content
+        length, and response time (plus 'cache_hit' when a cache is in use
+        and 'timings' when record_timings is set)
     """
     start_time = time.time()
+    cache = cache if cache is not None else http_cache
+    timings = start_timing() if record_timings else None
+    phase_start = time.perf_counter()
     try:
-        print(f"Fetching: {url}")
-        response = requests.get(url, timeout=timeout)
-        response.raise_for_status()  # Raise exception for bad status codes
+        if not quiet:
+            print(f"Fetching: {url}")
+        status, content_length, cache_hit = _download(url, timeout, max_body_size, sink, cache, timings)
         
-        result = {
-            'url': url,
-            'status': response.status_code,
-            'content_length': len(response.content),
-            'response_time': time.time() - start_time,
-            'success': True,
-            'error': None
-        }
-        print(f"Successfully fetched {url} ({response.status_code})")
-        return result
+        # Slot-based record: same keys as the old dict at a fraction of the memory
+        result = ScrapeResult(url, status, content_length, time.time() - start_time, True)
+        if cache is not None:
+            result.cache_hit = cache_hit
+        if not quiet:
+            print(f"Successfully fetched {url} ({status}{', cached' if cache_hit else ''})")
         
     except requests.exceptions.RequestException as e:
-        result = {
-            'url': url,
-            'status': None,
-            'content_length': 0,
-            'response_time': time.time() - start_time,
-            'success': False,
-            'error': str(e)
-        }
-        print(f"Failed to fetch {url}: {e}")
-        return result
+        # Keep the HTTP status of error responses so callers can tell 429/5xx from 404
+        status = e.response.status_code if isinstance(e, requests.exceptions.HTTPError) else None
+        result = ScrapeResult(url, status, 0, time.time() - start_time, False, str(e),
+                              error_kind=error_kind(e))
+        if not quiet:
+            print(f"Failed to fetch {url}: {e}")
+    
+    if timings is not None:
+        stop_timing()
+        timings.total = time.perf_counter() - phase_start
+        result.timings = timings
+    return result
 
 
-def process_results(results: List[Dict[str, any]]) -> None:
+def scrape_urls_adaptive(urls: Iterable[str], max_workers: int = 10, timeout: int = 10,
+                         controller: Optional[AIMDController] = None,
+                         fetch: Callable = None) -> List[Dict[str, any]]:
+    """
+    Scrape URLs with an adaptive (AIMD) in-flight limit per host
+    
+    URLs wait in per-host queues and are only handed to the thread pool when
+    their host has a free slot, so a slow host cannot occupy every worker.
+    
+    Args:
+        urls: URLs to scrape
+        max_workers: Maximum number of concurrent threads across all hosts
+        timeout: Request timeout for each URL
+        controller: AIMDController to use (its limits can be inspected live
+                    with controller.snapshot())
+        fetch: Fetch function to run per URL, e.g. RetryPolicy().wrap(fetch_url)
+    
+    Returns:
+        List of results in completion order
+    """
+    controller = controller or AIMDController(max_limit=max_workers)
+    fetch = fetch or fetch_url
+    default_pool.configure(max_workers)
+    queues: Dict[str, deque] = {}
+    for url in urls:
+        queues.setdefault(AIMDController.host_of(url), deque()).append(url)
+    
+    results = []
+    running = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        
+        def dispatch():
+            # Round-robin over hosts, one URL per host per pass, until every
+            # host is at its limit or all workers are busy
+            progress = True
+            while progress and len(running) < max_workers:
+                progress = False
+                for host, queue in list(queues.items()):
+                    if not queue:
+                        del queues[host]
+                        continue
+                    if len(running) >= max_workers:
+                        break
+                    started = controller.try_acquire(queue[0])
+                    if started is None:
+                        continue
+                    url = queue.popleft()
+                    running[executor.submit(fetch, url, timeout)] = (url, started)
+                    progress = True
+        
+        dispatch()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                url, started = running.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        'url': url,
+                        'status': None,
+                        'content_length': 0,
+                        'response_time': 0,
+                        'success': False,
+                        'error': str(e)
+                    }
+                controller.release(url, started, result)
+                results.append(result)
+            dispatch()
+    return results
+
+
+def scrape_urls_hedged(urls: List[str], max_workers: int = 5, timeout: int = 10,
+                       policy: Optional[HedgePolicy] = None,
+                       record_timings: bool = False,
+                       deadline: Optional[float] = None) -> List[Dict[str, any]]:
+    """
+    Scrape URLs, sending a duplicate request for any that run past the hedge
+    threshold and keeping whichever answer arrives first
+    
+    Args:
+        urls: List of URLs to scrape
+        max_workers: Maximum number of concurrent threads
+        timeout: Request timeout for each URL
+        policy: HedgePolicy with the threshold and the extra-load cap; hedges
+                run on ceil(max_workers * max_hedge_ratio) extra workers
+        record_timings: Attach per-phase timings to every result
+        deadline: Optional budget in seconds for the whole run. Both copies'
+                  timeouts are shortened to fit, no hedge is sent after it
+                  and URLs without an answer come back marked with
+                  error_kind 'deadline'
+    
+    Returns:
+        List of results in completion order
+    """
+    policy = policy or HedgePolicy()
+    deadline = Deadline.from_seconds(deadline)
+    fetch = fetch_with_deadline(deadline) if deadline is not None else fetch_url
+    # Hedges run on their own reserved workers: on the primary executor they
+    # would queue behind every URL not yet started
+    hedge_workers = max(1, math.ceil(max_workers * policy.max_hedge_ratio))
+    default_pool.configure(max_workers + hedge_workers)
+    started: Dict[tuple, float] = {}  # (url index, copy) -> monotonic start
+    results = []
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    hedge_executor = ThreadPoolExecutor(max_workers=hedge_workers)
+    try:
+        def submit(index: int, copy: int):
+            def timed_fetch():
+                # Hedge timing counts from when a worker picks the URL up,
+                # not from when it was queued
+                started[(index, copy)] = time.monotonic()
+                return fetch(urls[index], timeout, record_timings=record_timings)
+            future = (hedge_executor if copy else executor).submit(timed_fetch)
+            owner[future] = index
+            return future
+        
+        owner: Dict[any, int] = {}
+        attempts: Dict[int, List] = {}
+        for index in range(len(urls)):
+            policy.record_request()
+            attempts[index] = [submit(index, 0)]
+        
+        while attempts:
+            # Sleep until something completes or the next primary is due a
+            # hedge. Queued primaries start when any worker frees up (also
+            # when an ignored loser finishes), so never sleep longer than one
+            # threshold: a primary that starts meanwhile is checked in time
+            now = time.monotonic()
+            threshold = policy.threshold()
+            due = [started[(index, 0)] + threshold - now
+                   for index, futures in attempts.items()
+                   if len(futures) == 1 and (index, 0) in started]
+            wait_for = max(0.0, min(due, default=threshold))
+            if deadline is not None:
+                wait_for = min(wait_for, deadline.remaining())
+            live = [f for futures in attempts.values() for f in futures]
+            done, _ = wait(live, timeout=wait_for, return_when=FIRST_COMPLETED)
+            
+            for future in done:
+                index = owner.pop(future, None)
+                if index is None or index not in attempts:
+                    continue  # The other copy already won (possibly in this same batch)
+                siblings = attempts.pop(index)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        'url': urls[index],
+                        'status': None,
+                        'content_length': 0,
+                        'response_time': 0,
+                        'success': False,
+                        'error': str(e)
+                    }
+                if future is not siblings[0]:
+                    policy.record_win()
+                for copy, other in enumerate(siblings):
+                    if other is not future:
+                        # Cancels a copy still in the queue; a running one
+                        # finishes in the background and is ignored
+                        other.cancel()
+                        owner.pop(other, None)
+                    started.pop((index, copy), None)
+                policy.record_latency(result['response_time'])
+                results.append(result)
+            
+            if deadline is not None and deadline.expired and attempts:
+                # Deadline passed: cancel what is queued, stop waiting for the rest
+                for index, futures in attempts.items():
+                    for future in futures:
+                        future.cancel()
+                    results.append(timed_out_result(urls[index], deadline.seconds))
+                print(f"Deadline of {deadline.seconds:.2f}s reached: "
+                      f"{len(attempts)} URLs unfinished or cancelled")
+                break
+            
+            now = time.monotonic()
+            threshold = policy.threshold()
+            for index, futures in attempts.items():
+                primary_start = started.get((index, 0))
+                if (len(futures) == 1 and primary_start is not None
+                        and now - primary_start >= threshold and policy.try_hedge()):
+                    print(f"Hedging {urls[index]} after {now - primary_start:.2f}s")
+                    futures.append(submit(index, 1))
+    
+    finally:
+        # Return once every URL has a winner: losing copies still running
+        # finish in the background instead of holding up the caller
+        executor.shutdown(wait=False, cancel_futures=True)
+        hedge_executor.shutdown(wait=False, cancel_futures=True)
+    
+    return results
+
+
+def read_urls(path: str) -> Iterator[str]:
+    """
+    Lazily yield URLs from a text file, one per line
+    
+    Args:
+        path: File with one URL per line; blank lines and '#' comments are skipped
+    
+    Yields:
+        URLs, without reading the whole file into memory
+    """
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith('#'):
+                yield line
+
+
+def timed_out_result(url: str, response_time: float = 0.0) -> ScrapeResult:
+    """Result for a URL that was cancelled or cut off by an overall deadline"""
+    return ScrapeResult(url, None, 0, response_time, False, "Deadline exceeded",
+                        error_kind='deadline')
+
+
+def fetch_with_deadline(deadline: Deadline, fetch: Callable = None) -> Callable:
+    """
+    Wrap a fetch function so it respects an overall deadline
+    
+    Args:
+        deadline: Deadline for the whole run
+        fetch: Fetch function to wrap (defaults to fetch_url)
+    
+    Returns:
+        Callable that skips URLs once the deadline has passed and shortens
+        each request's timeout to the time that is left
+    """
+    fetch = fetch or fetch_url
+    
+    def bounded_fetch(url: str, timeout: float = 10, *args, **kwargs):
+        if deadline.expired:
+            return timed_out_result(url)
+        return fetch(url, deadline.clamp(timeout), *args, **kwargs)
+    return bounded_fetch
+
+
+def scrape_urls_streaming(urls: Iterable[str], max_workers: int = 5,
+                          max_in_flight: Optional[int] = None,
+                          timeout: int = 10, fetch: Callable = None,
+                          deadline: Optional[float] = None) -> Iterator[Dict[str, any]]:
+    """
+    Scrape any iterable of URLs, yielding results as they complete
+    
+    At most max_in_flight futures exist at any time, so memory stays flat no
+    matter how long the input is, and the first results are available as
+    soon as the first requests finish.
+    
+    Args:
+        urls: Iterable of URLs (a list, a generator, read_urls(path), ...)
+        max_workers: Maximum number of concurrent threads
+        max_in_flight: Maximum number of submitted but unconsumed futures
+                       (defaults to 2 * max_workers so workers never idle)
+        timeout: Request timeout for each URL
+        fetch: Fetch function to run per URL, e.g. RetryPolicy().wrap(fetch_url)
+        deadline: Overall budget in seconds; afterwards no more URLs are read,
+                  in-flight ones are yielded as timed out and the generator ends
+    
+    Yields:
+        Result dictionaries in completion order
+    """
+    max_in_flight = max_in_flight or 2 * max_workers
+    fetch = fetch or fetch_url
+    deadline = Deadline.from_seconds(deadline)
+    if deadline is not None:
+        fetch = fetch_with_deadline(deadline, fetch)
+    default_pool.configure(max_workers)
+    url_iter = iter(urls)
+    
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    
+    def submit_more():
+        # Top up the window from the lazy input
+        if deadline is not None and deadline.expired:
+            return
+        for url in url_iter:
+            pending[executor.submit(fetch, url, timeout)] = url
+            if len(pending) >= max_in_flight:
+                break
+    
+    try:
+        submit_more()
+        while pending:
+            wait_for = deadline.remaining() if deadline is not None else None
+            done, _ = wait(pending, timeout=wait_for, return_when=FIRST_COMPLETED)
+            if not done:
+                # Deadline passed: give up on everything still outstanding
+                for future, url in pending.items():
+                    future.cancel()
+                    yield timed_out_result(url, deadline.seconds)
+                pending.clear()
+                break
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {
+                        'url': url,
+                        'status': None,
+                        'content_length': 0,
+                        'response_time': 0,
+                        'success': False,
+                        'error': str(e)
+                    }
+                yield result
+            submit_more()
+    finally:
+        # With a deadline, don't wait for requests that are still running;
+        # their clamped timeouts end them shortly
+        executor.shutdown(wait=deadline is None, cancel_futures=True)
+
+
+def scrape_urls_resumable(urls: Iterable[str], checkpoint_path: str,
+                          max_workers: int = 5, timeout: int = 10,
+                          retry_failed: bool = False, batch_size: int = 500,
+                          deadline: Optional[float] = None, **kwargs) -> Iterator[Dict[str, any]]:
+    """
+    Streaming scrape that checkpoints finished URLs and resumes after a crash
+    
+    The input is read batch_size URLs at a time and each batch is looked up
+    in the checkpoint with one query, so memory stays flat however long the
+    input is. Stored results of the batch are replayed, only the rest is
+    fetched. New results are written by the store's background thread in
+    batches, off the workers' hot path, and are committed before the next
+    batch is looked up. The checkpoint is keyed by URL: a URL repeated in the
+    same batch is fetched and yielded once, a repeat in a later batch is
+    answered from the checkpoint, so a fresh run and a resumed one return the
+    same results.
+    
+    Args:
+        urls: Iterable of URLs to scrape
+        checkpoint_path: SQLite file holding finished URLs and their results;
+                         use one per job, as its results are replayed
+        max_workers: Maximum number of concurrent threads
+        timeout: Request timeout for each URL
+        retry_failed: Fetch URLs again whose stored result was a failure
+        batch_size: URLs read from the input and looked up at a time
+        deadline: Overall budget in seconds for the whole run
+        **kwargs: Passed on to scrape_urls_streaming (max_in_flight, fetch, ...)
+    
+    Yields:
+        Per batch: replayed results, then new results in completion order
+    
+    Raises:
+        RuntimeError: If the checkpoint writer failed
+    """
+    deadline = Deadline.from_seconds(deadline)
+    url_iter = iter(urls)
+    resumed = 0
+    with CheckpointStore(checkpoint_path) as store:
+        while deadline is None or not deadline.expired:
+            batch = list(dict.fromkeys(itertools.islice(url_iter, batch_size)))
+            if not batch:
+                break
+            store.flush()  # Earlier batches are visible to the lookup
+            done = store.lookup(batch, include_failed=not retry_failed)
+            resumed += len(done)
+            for url in batch:
+                if url in done:
+                    yield done[url]
+            
+            remaining = [url for url in batch if url not in done]
+            for result in scrape_urls_streaming(remaining, max_workers=max_workers, timeout=timeout,
+                                                deadline=deadline.remaining() if deadline else None,
+                                                **kwargs):
+                # Cut-off URLs are not done; leave them for the next run
+                if result.get('error_kind') != 'deadline':
+                    store.record(result)
+                yield result
+    if resumed:
+        print(f"Resumed: {resumed} URLs replayed from {checkpoint_path}")
+
+
+def scrape_urls_to_sink(urls: Iterable[str], sink: ResultSink, max_workers: int = 5,
+                        timeout: int = 10, **kwargs) -> ResultAggregator:
+    """
+    Streaming scrape that writes every result to a sink instead of a list
+    
+    Memory stays flat however many URLs there are: each result is summarized
+    and handed to the sink's writer thread, then dropped. If the writer falls
+    behind, sink.write() blocks and the streaming window stops submitting.
+    
+    Args:
+        urls: Iterable of URLs to scrape
+        sink: ResultSink (JSONLSink, ParquetSink, ...); started and closed here
+        max_workers: Maximum number of concurrent threads
+        timeout: Request timeout for each URL
+        **kwargs: Passed on to scrape_urls_streaming (max_in_flight, deadline, ...)
+    
+    Returns:
+        ResultAggregator summarizing everything written (for process_results)
+    """
+    stats = ResultAggregator()
+    with sink:
+        for result in scrape_urls_streaming(urls, max_workers=max_workers,
+                                            timeout=timeout, **kwargs):
+            stats.add(result)
+            sink.write(result)
+    print(f"Wrote {sink.records_written} results in {sink.batches_written} batches "
+          f"(writer backpressure: {sink.blocked_time:.2f}s)")
+    return stats
+
+
+def process_results(results) -> None:
     """
     Process and display scraping results
     
     Args:
-        results: List of scraping results
+        results: Iterable of scraping results, or a ResultAggregator that
+                 already summarized them
     """
-    successful = [r for r in results if r['success']]
-    failed = [r for r in results if not r['success']]
+    # Single pass; nothing is kept per URL except the first few failures
+    if isinstance(results, ResultAggregator):
+        stats = results
+    else:
+        stats = ResultAggregator().add_all(results)
     
     print(f"\n=== SCRAPING RESULTS ===")
-    print(f"Total URLs: {len(results)}")
-    print(f"Successful: {len(successful)}")
-    print(f"Failed: {len(failed)}")
+    print(f"Total URLs: {stats.total}")
+    print(f"Successful: {stats.successful}")
+    print(f"Failed: {stats.failed}")
     
-    if successful:
-        avg_response_time = sum(r['response_time'] for r in successful) / len(successful)
-        total_content = sum(r['content_length'] for r in successful)
-        print(f"Average response time: {avg_response_time:.2f}s")
-        print(f"Total content downloaded: {total_content:,} bytes")
+    if stats.successful:
+        latency = stats.latency
+        print(f"Average response time: {stats.avg_response_time:.2f}s")
+        print(f"Latency p50/p95/p99: {latency.percentile(50):.2f}s / "
+              f"{latency.percentile(95):.2f}s / {latency.percentile(99):.2f}s")
+        print(f"Total content downloaded: {stats.total_bytes:,} bytes")
+        
+        if stats.cache_tracked:
+            print(f"Cache hits: {stats.cache_hits}/{stats.successful} ({stats.bytes_saved:,} bytes saved)")
     
-    if failed:
+    if stats.errors:
         print(f"\nFailed URLs:")
-        for result in failed:
-            print(f"  - {result['url']}: {result['error']}")
+        for url, error in stats.errors:
+            print(f"  - {url}: {error}")
+        if stats.failed > len(stats.errors):
+            print(f"  ... and {stats.failed - len(stats.errors)} more")
+
+
+
+def process_timings(results) -> None:
+    """
+    Display per-phase timing statistics (DNS, connect, TLS, TTFB, transfer)
+    
+    Args:
+        results: Iterable of scraping results, or a TimingAggregator
+    """
+    if isinstance(results, TimingAggregator):
+        stats = results
+    else:
+        stats = TimingAggregator().add_all(results)
+    
+    print(f"\n=== REQUEST PHASES ===")
+    print(f"Timed requests: {stats.count} ({stats.new_connections} new connections)")
+    for name, phase in stats.report().items():
+        print(f"  {name:<9} mean {phase['mean'] * 1000:8.1f}ms  "
+              f"p50 {phase['p50'] * 1000:8.1f}ms  p95 {phase['p95'] * 1000:8.1f}ms")
 
 
 
-def scrape_with_retry(url: str, max_retries: int = 3, delay: float = 1.0) -> Dict[str, any]:
+def scrape_with_retry(url: str, max_retries: int = 3, delay: float = 1.0,
+                      policy: Optional[RetryPolicy] = None) -> Dict[str, any]:
     """
     Fetch URL with retry logic
     
+    Timeouts, connection errors, 429 and 5xx are retried with decorrelated
+    jitter backoff; other 4xx fail at once. Retries draw from the
+    process-wide retry budget, so an outage cannot multiply the load.
+    
     Args:
         url: URL to fetch
         max_retries: Maximum number of retry attempts
-        delay: Delay between retries in seconds
+        delay: Base delay between retries in seconds
+        policy: RetryPolicy to use instead of one built from max_retries/delay
     
     Returns:
-        Result dictionary
+        Result dictionary (with 'attempts')
     """
-    for attempt in range(max_retries + 1):
-        try:
-            if attempt > 0:
-                print(f"Retry {attempt} for {url}")
-                time.sleep(delay * attempt)  # Exponential backoff
-            
-            return fetch_url(url)
-            
-        except Exception as e:
-            if attempt == max_retries:
-                return {
-                    'url': url,
-                    'status': None,
-                    'content_length': 0,
-                    'response_time': 0,
-                    'success': False,
-                    'error': f"Failed after {max_retries} retries: {str(e)}"
-                }
-            continue
+    policy = policy or RetryPolicy(max_retries=max_retries, base_delay=delay)
+    return policy.call(fetch_url, url)
 
 def scrape_with_custom_headers(url: str, headers: Dict[str, str] = None) -> Dict[str, any]:
     """
@@ -138,7 +733,7 @@ def scrape_with_custom_headers(url: str, headers: Dict[str, str] = None) -> Dict
         }
     
     try:
-        response = requests.get(url, headers=headers, timeout=10)
+        response = default_pool.get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         return {
@@ -163,46 +758,33 @@ def scrape_with_custom_headers(url: str, headers: Dict[str, str] = None) -> Dict
         }
 
 def batch_scrape_with_rate_limiting(urls: List[str], max_workers: int = 5, 
-                                   requests_per_second: float = 2.0) -> List[Dict[str, any]]:
+                                   requests_per_second: float = 2.0,
+                                   burst: Optional[float] = None,
+                                   deadline: Optional[float] = None) -> List[Dict[str, any]]:
     """
     Scrape URLs with rate limiting to be respectful to servers
     
     Args:
         urls: List of URLs to scrape
         max_workers: Maximum number of concurrent threads
-        requests_per_second: Maximum requests per second
+        requests_per_second: Maximum requests per second for each host
+        burst: Requests allowed back to back before throttling kicks in
+        deadline: Optional budget in seconds for the whole run. URLs whose
+                  turn comes after it are not fetched and come back marked
+                  with error_kind 'deadline'. A URL already waiting for its
+                  rate-limit slot still finishes that wait first
     
     Returns:
         List of results
     """
-    import threading
-    from queue import Queue
-    
-    # Rate limiting using a semaphore and timer
-    request_times = Queue()
-    rate_limit_lock = threading.Lock()
-    
-    def rate_limited_fetch(url: str) -> Dict[str, any]:
-        with rate_limit_lock:
-            now = time.time()
-            
-            # Remove old timestamps
-            while not request_times.empty():
-                if now - request_times.queue[0] > 1.0:  # Remove timestamps older than 1 second
-                    request_times.get()
-                else:
-                    break
-            
-            # Check if we need to wait
-            if request_times.qsize() >= requests_per_second:
-                sleep_time = 1.0 / requests_per_second
-                time.sleep(sleep_time)
-            
-            request_times.put(now)
-        
-        return fetch_url(url)
+    # Per-host token buckets; waiting threads sleep without holding a lock
+    limiter = HostRateLimiter(requests_per_second, burst=burst)
+    # The deadline is checked after the rate-limit wait, when the request starts
+    deadline = Deadline.from_seconds(deadline)
+    rate_limited_fetch = limiter.wrap(fetch_with_deadline(deadline) if deadline else fetch_url)
     
     print(f"Starting rate-limited scraping ({requests_per_second} req/s) with {max_workers} workers...")
+    default_pool.configure(max_workers)
     start_time = time.time()
     
     with ThreadPoolExecutor(max_workers=max_workers) as executor:
@@ -210,4 +792,5 @@ def batch_scrape_with_rate_limiting(urls: List[str], max_workers: int = 5,
     
     total_time = time.time() - start_time
     print(f"Rate-limited scraping completed in {total_time:.2f} seconds")
+    limiter.print_report()
     return results
\ No newline at end of file